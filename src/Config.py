@@ -62,6 +62,11 @@ class Option:
       default: The default value if not specified in config file.
       text: Human-readable description of this option.
       options: List or dict of valid values for this option.
+      values: Selectable values in menu order: the options list itself, or
+          the sorted descriptions of a dict, or None without options.
+      valueIndex: Dict mapping each entry of values to its position.
+      reverseOptions: For dict options, a dict mapping each description
+          back to its value; empty otherwise.
   """
   
   def __init__(self, **args):
@@ -97,8 +102,26 @@ def define(section, option, type, default = None, text = None, options = None, p
     
   if type == bool and not options:
     options = [True, False]
+
+  # precompute the menu ordering so choices don't need to sort and search
+  if isinstance(options, dict):
+    values = sorted(options.values())
+  elif isinstance(options, list):
+    values = options
+  else:
+    values = None
+
+  valueIndex = {}
+  for i, v in enumerate(values or []):
+    valueIndex.setdefault(v, i)
+
+  reverseOptions = {}
+  if isinstance(options, dict):
+    for k, v in options.items():
+      reverseOptions.setdefault(v, k)
     
-  prototype[section][option] = Option(type = type, default = default, text = text, options = options)
+  prototype[section][option] = Option(type = type, default = default, text = text, options = options,
+                                      values = values, valueIndex = valueIndex, reverseOptions = reverseOptions)
 
 def load(fileName = None, setAsDefault = False):
   """Load a configuration file with the default prototype.
@@ -155,6 +178,8 @@ class Config:
       self.config.read(fileName)
   
     self.fileName  = fileName
+    self.batchDepth = 0
+    self.dirty      = False
   
     # fix the defaults and non-existing keys
     for section, options in list(prototype.items()):
@@ -204,11 +229,40 @@ class Config:
     #Log.debug("%s.%s = %s" % (section, option, value))
     return value
 
+  def beginBatch(self):
+    """Start a batch of configuration changes.
+    
+    Values passed to set() while a batch is open are only updated in
+    memory; the file is written once when the outermost batch is closed
+    with endBatch(). Batches may be nested.
+    """
+    self.batchDepth += 1
+
+  def endBatch(self):
+    """Finish a batch of configuration changes.
+    
+    Writes the configuration file if any value was set since the
+    outermost beginBatch() call.
+    """
+    self.batchDepth -= 1
+    if self.batchDepth <= 0:
+      self.batchDepth = 0
+      if self.dirty:
+        self.write()
+
+  def write(self):
+    """Write the entire configuration to the configuration file."""
+    f = open(self.fileName, "w")
+    self.config.write(f)
+    f.close()
+    self.dirty = False
+
   def set(self, section, option, value):
     """Set a configuration value and persist to file.
     
     Updates the configuration value and immediately writes the entire
-    configuration to the file. Creates the section if it doesn't exist.
+    configuration to the file, unless a batch is open (see beginBatch()).
+    Creates the section if it doesn't exist.
     
     Args:
         section: Section name (e.g., "audio").
@@ -232,10 +286,10 @@ class Config:
       value = str(value)
 
     self.config.set(section, option, value)
-    
-    f = open(self.fileName, "w")
-    self.config.write(f)
-    f.close()
+    self.dirty = True
+
+    if not self.batchDepth:
+      self.write()
 
 def get(section, option):
   """Read a value from the global configuration.
@@ -117,6 +117,28 @@ class Engine:
         if queues:
             task.stopped()
 
+    def removeTasks(self, tasks):
+        """
+        Remove several tasks from the engine at once.
+        
+        Equivalent to calling removeTask() for each task, but each task
+        queue is filtered only once.
+        
+        Args:
+            tasks (list): The tasks to remove
+        """
+        tasks = set(tasks)
+        if not tasks:
+            return
+        removed = {}
+        for queue in [self.tasks, self.frameTasks]:
+            kept = [t for t in queue if t not in tasks]
+            if len(kept) != len(queue):
+                removed.update((t, None) for t in queue if t in tasks)
+                queue[:] = kept
+        for task in removed:
+            task.stopped()
+
     def _getTaskQueues(self, task):
         """Get all queues containing the specified task."""
         queues = []
@@ -698,7 +698,7 @@ class GuitarSceneClient(GuitarScene, SceneClient):
       if self.song and self.song.info.tutorial:
         glColor3f(1, 1, 1)
         pos = self.getSongPosition()
-        for time, event in self.song.track.getEvents(pos - self.song.period * 2, pos + self.song.period * 4):
+        for time, event in self.song.scriptTrack.getEvents(pos - self.song.period * 2, pos + self.song.period * 4):
           if isinstance(event, PictureEvent):
             if pos < time or pos > time + event.length:
               continue
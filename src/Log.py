@@ -74,7 +74,7 @@ else:
     "error":  "(E)",
   }
 
-def log(cls, msg):
+def log(cls, msg, *args):
   """Write a log message with the specified classification.
   
   Outputs the message to the log file, and optionally to the console
@@ -84,44 +84,52 @@ def log(cls, msg):
   Args:
       cls: Log classification - one of 'debug', 'notice', 'warn', 'error'.
       msg: The message to log. Will be converted to string if needed.
+      *args: Optional values to %-format into the message.
   """
-  msg = str(msg)
+  if args:
+    msg = msg % args
+  else:
+    msg = str(msg)
   if not quiet:
     print(labels[cls] + " " + msg)
   print(labels[cls] + " " + msg, file=logFile)
 
 
-def warn(msg):
+def warn(msg, *args):
   """Log a warning message.
   
   Args:
       msg: The warning message to log.
+      *args: Optional values to %-format into the message.
   """
-  log("warn", msg)
+  log("warn", msg, *args)
 
 
-def debug(msg):
+def debug(msg, *args):
   """Log a debug message.
   
   Args:
       msg: The debug message to log.
+      *args: Optional values to %-format into the message.
   """
-  log("debug", msg)
+  log("debug", msg, *args)
 
 
-def notice(msg):
+def notice(msg, *args):
   """Log an informational notice.
   
   Args:
       msg: The notice message to log.
+      *args: Optional values to %-format into the message.
   """
-  log("notice", msg)
+  log("notice", msg, *args)
 
 
-def error(msg):
+def error(msg, *args):
   """Log an error message.
   
   Args:
       msg: The error message to log.
+      *args: Optional values to %-format into the message.
   """
-  log("error", msg)
+  log("error", msg, *args)
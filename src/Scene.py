@@ -38,32 +38,32 @@ from OpenGL.GLU import *
 import math
 import colorsys
 import pygame
+import builtins
 
 
 class ObjectCollection:
   """Collection of game objects with ID-based access."""
   def __init__(self):
     self.objects = {}
+    self._idByObj = {}
     self._nextId = 0
 
   def add(self, obj):
     self._nextId += 1
-    self.objects[self._nextId] = obj
+    self[self._nextId] = obj
     return self._nextId
 
   def remove(self, id):
-    if id in self.objects:
-      del self.objects[id]
+    obj = self.objects.pop(id, None)
+    if obj is not None:
+      self._idByObj.pop(builtins.id(obj), None)
 
   def get(self, id):
     return self.objects.get(id)
 
   def id(self, obj):
     """Get the ID for an object."""
-    for id, o in self.objects.items():
-      if o is obj:
-        return id
-    return None
+    return self._idByObj.get(builtins.id(obj))
 
   def __iter__(self):
     return iter(self.objects.values())
@@ -72,11 +72,17 @@ class ObjectCollection:
     return self.objects[id]
 
   def __setitem__(self, id, value):
+    self.remove(id)
     self.objects[id] = value
+    self._idByObj[builtins.id(value)] = id
 
 
 class Scene(BackgroundLayer):
   """Base class for game scenes."""
+
+  # Whether a deleted instance may be reset() and reused by the session
+  reusable = False
+
   def __init__(self, engine, owner, **args):
     self.objects = ObjectCollection()
     self.args    = args
@@ -87,14 +93,26 @@ class Scene(BackgroundLayer):
     self.world   = None
     self.space   = None
     self.time    = 0.0
-    self.players = []
+    self.players = {}
+    self.createCommon(**args)
+
+  def reset(self, engine, owner, **args):
+    """Reinitialize a previously deleted scene so that it can be reused."""
+    self.objects = ObjectCollection()
+    self.args    = args
+    self.owner   = owner
+    self.engine  = engine
+    self.camera  = Camera()
+    self.time    = 0.0
+    del self.actors[:]
+    self.players.clear()
     self.createCommon(**args)
 
   def addPlayer(self, player):
-    self.players.append(player)
+    self.players[id(player)] = player
 
   def removePlayer(self, player):
-    self.players.remove(player)
+    self.players.pop(id(player), None)
 
   def createCommon(self, **args):
     pass
@@ -111,6 +129,16 @@ class SceneClient(Scene, KeyListener):
   def __init__(self, engine, owner, session, **args):
     Scene.__init__(self, engine, owner, **args)
     self.session = session
+    self.view = engine.view
+    self.player = self.session.getLocalPlayer()
+    self.controls = Player.Controls()
+    self.createClient(**args)
+
+  def reset(self, engine, owner, session, **args):
+    """Reinitialize a previously deleted scene for a new session visit."""
+    Scene.reset(self, engine, owner, **args)
+    self.session = session
+    self.view = engine.view
     self.player = self.session.getLocalPlayer()
     self.controls = Player.Controls()
     self.createClient(**args)
@@ -155,26 +183,24 @@ class SceneClient(Scene, KeyListener):
       actor.render()
 
   def render(self, visibility, topMost):
-    font = self.engine.data.font
-
-    # render the scene
-    try:
-      glMatrixMode(GL_PROJECTION)
-      glPushMatrix()
-      glLoadIdentity()
-      gluPerspective(60, self.engine.view.aspectRatio, 0.1, 1000)
-      glMatrixMode(GL_MODELVIEW)
-      glLoadIdentity()
-      
-      glPushMatrix()
-      self.camera.apply()
-  
-      self.render3D()
-    finally:
-      glPopMatrix()
-      glMatrixMode(GL_PROJECTION)
-      glPopMatrix()
-      glMatrixMode(GL_MODELVIEW)
+    # render the scene; if render3D() raises, GameEngine.run() resets the
+    # matrix stacks, so no cleanup is needed here
+    glMatrixMode(GL_PROJECTION)
+    glPushMatrix()
+    glLoadIdentity()
+    gluPerspective(60, self.view.aspectRatio, 0.1, 1000)
+    glMatrixMode(GL_MODELVIEW)
+    glLoadIdentity()
+    
+    glPushMatrix()
+    self.camera.apply()
+
+    self.render3D()
+
+    glPopMatrix()
+    glMatrixMode(GL_PROJECTION)
+    glPopMatrix()
+    glMatrixMode(GL_MODELVIEW)
 
 
 # SceneServer is kept as a stub for compatibility
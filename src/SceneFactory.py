@@ -26,7 +26,9 @@ Scene creation factory for Frets on Fire.
 
 This module provides a factory pattern implementation for dynamically creating
 game scene instances. It handles the import and instantiation of scene classes
-such as GuitarScene, SongChoosingScene, and GameResultsScene.
+such as GuitarScene, SongChoosingScene, and GameResultsScene. All scene modules
+are imported when this module is first loaded, so switching scenes never goes
+through the import machinery.
 
 The factory abstracts away the scene creation details, allowing the game engine
 and session management to create scenes by name without needing direct imports.
@@ -53,12 +55,34 @@ def _import(name):
   globals()[name] = __import__(name)
 
 
+# Scene client classes keyed by scene name, resolved once at import time
+_dispatch = {}
+
+for _name in scenes:
+  _import(_name)
+  _dispatch[_name] = getattr(globals()[_name], _name + "Client")
+del _name
+
+
+def lookup(name):
+  """
+  Get the class used to create a scene.
+  
+  Args:
+      name: The name of the scene (e.g., "GuitarScene").
+  
+  Returns:
+      The scene's Client class (e.g., GuitarSceneClient).
+  """
+  return _dispatch[name]
+
+
 def create(engine, name, owner, server = None, session = None, **args):
   """
   Create and return a scene instance by name.
   
-  This factory function dynamically imports the specified scene module
-  and instantiates its Client variant. For single-player mode, only
+  This factory function looks up the Client variant of the specified
+  scene and instantiates it. For single-player mode, only
   the Client version of scenes is used.
   
   Args:
@@ -80,8 +104,5 @@ def create(engine, name, owner, server = None, session = None, **args):
       >>> scene = create(engine, "GuitarScene", None, session=session,
       ...                libraryName="songs", songName="tutorial")
   """
-  _import(name)
-
-  m = globals()[name]
   # For single-player, always use the Client version of scenes
-  return getattr(m, name + "Client")(engine = engine, owner = owner, session = session, **args)
+  return _dispatch[name](engine = engine, owner = owner, session = session, **args)
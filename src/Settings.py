@@ -45,6 +45,37 @@ import Mod
 import Audio
 
 import pygame
+from itertools import chain
+from functools import lru_cache
+
+@lru_cache(maxsize = 256)
+def keycode(k):
+  """
+  Resolve a configured key binding to a pygame key code.
+  
+  Args:
+      k: Either a numeric key code or a pygame constant name (e.g. 'K_LEFT').
+  
+  Returns:
+      int: The pygame key code.
+  """
+  try:
+    return int(k)
+  except:
+    return getattr(pygame, k)
+
+@lru_cache(maxsize = 256)
+def keyName(k):
+  """
+  Get the display name of a configured key binding.
+  
+  Args:
+      k: Either a numeric key code or a pygame constant name (e.g. 'K_LEFT').
+  
+  Returns:
+      str: The capitalized key name as reported by pygame.
+  """
+  return pygame.key.name(keycode(k)).capitalize()
 
 class ConfigChoice(Menu.Choice):
   """
@@ -71,19 +102,11 @@ class ConfigChoice(Menu.Choice):
     self.autoApply = autoApply
     o = config.prototype[section][option]
     v = config.get(section, option)
+    values = o.values
     if isinstance(o.options, dict):
-      values     = list(o.options.values())
-      values.sort()
-      try:
-        valueIndex = values.index(o.options[v])
-      except KeyError:
-        valueIndex = 0
+      valueIndex = o.valueIndex.get(o.options.get(v), 0)
     elif isinstance(o.options, list):
-      values     = o.options
-      try:
-        valueIndex = values.index(v)
-      except ValueError:
-        valueIndex = 0
+      valueIndex = o.valueIndex.get(v, 0)
     else:
       raise RuntimeError("No usable options for %s.%s." % (section, option))
     Menu.Choice.__init__(self, text = o.text, callback = self.change, values = values, valueIndex = valueIndex)
@@ -98,10 +121,7 @@ class ConfigChoice(Menu.Choice):
     o = self.config.prototype[self.section][self.option]
     
     if isinstance(o.options, dict):
-      for k, v in list(o.options.items()):
-        if v == value:
-          value = k
-          break
+      value = o.reverseOptions.get(value, value)
     
     self.changed = True
     self.value   = value
@@ -111,8 +131,10 @@ class ConfigChoice(Menu.Choice):
 
   def apply(self):
     """Apply the changed value to the configuration if modified."""
-    if self.changed:
-      self.config.set(self.section, self.option, self.value)
+    if not self.changed:
+      return
+    self.config.set(self.section, self.option, self.value)
+    self.changed = False
 
 class VolumeConfigChoice(ConfigChoice):
   """
@@ -162,6 +184,7 @@ class KeyConfigChoice(Menu.Choice):
     self.option  = option
     self.changed = False
     self.value   = None
+    self._cachedText = None
     Menu.Choice.__init__(self, text = "", callback = self.change)
 
   def getText(self, selected):
@@ -174,14 +197,12 @@ class KeyConfigChoice(Menu.Choice):
     Returns:
         str: Formatted string with control name and key name.
     """
-    def keycode(k):
-      try:
-        return int(k)
-      except:
-        return getattr(pygame, k)
+    if self._cachedText is not None:
+      return self._cachedText
     o = self.config.prototype[self.section][self.option]
     v = self.config.get(self.section, self.option)
-    return "%s: %s" % (o.text, pygame.key.name(keycode(v)).capitalize())
+    self._cachedText = "%s: %s" % (o.text, keyName(v))
+    return self._cachedText
     
   def change(self):
     """
@@ -191,17 +212,11 @@ class KeyConfigChoice(Menu.Choice):
     is pressed, updates the configuration and reloads controls.
     """
     o = self.config.prototype[self.section][self.option]
-
-    if isinstance(o.options, dict):
-      for k, v in list(o.options.items()):
-        if v == value:
-          value = k
-          break
-
     key = Dialogs.getKey(self.engine, _("Press a key for '%s' or Escape to cancel.") % (o.text))
 
     if key:
       self.config.set(self.section, self.option, key)
+      self._cachedText = None
       self.engine.input.reloadControls()
 
   def apply(self):
@@ -220,8 +235,8 @@ class SettingsMenu(Menu.Menu):
   
   Attributes:
       engine: The game engine instance.
-      settingsToApply: List of all ConfigChoice instances that need
-          to be saved when applying settings.
+      settingsToApply: List of all unique ConfigChoice instances that
+          need to be saved when applying settings.
   """
   
   def __init__(self, engine):
@@ -299,12 +314,14 @@ class SettingsMenu(Menu.Menu):
       (_("Audio Settings"),    audioSettingsMenu),
     ]
 
-    self.settingsToApply = settings + \
-                           videoSettings + \
-                           audioSettings + \
-                           volumeSettings + \
-                           gameSettings + \
-                           modSettings
+    # Collect each ConfigChoice once; the category lists contain submenus
+    # and action tuples too, and may share entries
+    seen = set()
+    self.settingsToApply = []
+    for o in chain(videoSettings, audioSettings, volumeSettings, gameSettings, modSettings):
+      if isinstance(o, ConfigChoice) and id(o) not in seen:
+        seen.add(id(o))
+        self.settingsToApply.append(o)
 
     Menu.Menu.__init__(self, engine, settings)
 
@@ -315,9 +332,13 @@ class SettingsMenu(Menu.Menu):
     Iterates through all setting options and applies any changes,
     then displays a message prompting the user to restart the game.
     """
-    for option in self.settingsToApply:
-      if isinstance(option, ConfigChoice):
+    config = self.engine.config
+    config.beginBatch()
+    try:
+      for option in self.settingsToApply:
         option.apply()
+    finally:
+      config.endBatch()
 
     Dialogs.showMessage(self.engine, _("Settings saved. Please restart the game to activate the new settings."))
 
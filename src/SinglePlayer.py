@@ -33,7 +33,7 @@ original networked Session/World/Lobby system. It manages:
 - Cleanup and return to main menu
 
 The SinglePlayerSession class acts as a local coordinator, while
-SinglePlayerGameTask provides the task-based interface for the engine.
+SinglePlayerGameTask provides a task-like controller for the session.
 
 Typical usage:
     session = SinglePlayerSession(engine)
@@ -42,7 +42,7 @@ Typical usage:
 
 Classes:
     SinglePlayerSession: Manages player and scene state for single-player games.
-    SinglePlayerGameTask: Engine task wrapper for session management.
+    SinglePlayerGameTask: Controller wrapper for session management.
 """
 
 from Player import Player
@@ -50,9 +50,21 @@ from Language import _
 import SceneFactory
 import Song
 import Config
+import Log
+
+from itertools import count
 
 STARTUP_SCENE = "SongChoosingScene"
 
+# Maximum number of deleted scenes kept for reuse per scene class
+SCENE_POOL_SIZE = 4
+
+# Players left over from finished sessions, reused by createPlayer()
+_playerPool = []
+
+# MainMenu class, imported on first use since MainMenu imports this module
+_MainMenu = None
+
 class SinglePlayerSession:
   """
   A simplified session manager for single-player games.
@@ -64,13 +76,27 @@ class SinglePlayerSession:
   Attributes:
       engine: Reference to the GameEngine instance.
       player: The local Player object, or None if not created.
-      scenes: List of currently active Scene instances.
+      scenes: Dictionary mapping object IDs to the currently active Scene
+          instances, in creation order.
       objects: Dictionary mapping object IDs to game objects.
-      _nextId: Counter for generating unique object IDs.
+      _idByObj: Dictionary mapping id() of each object in objects to its
+          object ID.
+      _pushedLayers: Set of id() values of scenes pushed onto the view.
+      _scenePools: Dictionary mapping scene classes to lists of deleted
+          reusable scenes.
+      _startupFactory: Scene class used for STARTUP_SCENE.
+      _nextIds: Iterator yielding unique object IDs.
       id: The local player's ID (always 1 for single-player).
       isConnected: Compatibility flag (always True for single-player).
   """
 
+  __slots__ = ("engine", "player", "scenes", "objects", "_idByObj", "_pushedLayers",
+               "_scenePools", "_startupFactory", "_nextIds")
+
+  # Local player ID and compatibility flag, constant for single-player
+  id = 1
+  isConnected = True
+
   def __init__(self, engine):
     """Initialize the single-player session.
 
@@ -79,11 +105,13 @@ class SinglePlayerSession:
     """
     self.engine = engine
     self.player = None
-    self.scenes = []
+    self.scenes = {}
     self.objects = {}
-    self._nextId = 1
-    self.id = 1  # Local player ID
-    self.isConnected = True
+    self._idByObj = {}
+    self._pushedLayers = set()
+    self._scenePools = {}
+    self._startupFactory = SceneFactory.lookup(STARTUP_SCENE)
+    self._nextIds = count(1)
 
   def generateId(self):
     """Generate a unique object ID.
@@ -91,9 +119,7 @@ class SinglePlayerSession:
     Returns:
         Integer ID, incrementing with each call.
     """
-    id = self._nextId
-    self._nextId += 1
-    return id
+    return next(self._nextIds)
 
   def createPlayer(self, name):
     """Create and register the local player.
@@ -104,7 +130,11 @@ class SinglePlayerSession:
     Returns:
         The newly created Player instance.
     """
-    self.player = Player(self.id, name)
+    if _playerPool:
+      self.player = _playerPool.pop()
+      self.player.reset()
+    else:
+      self.player = Player(self.id, name)
     return self.player
 
   def getLocalPlayer(self):
@@ -115,10 +145,22 @@ class SinglePlayerSession:
     """
     return self.player
 
+  def getId(self, obj):
+    """Get the object ID of a registered object.
+
+    Args:
+        obj: An object stored in objects.
+
+    Returns:
+        The object's integer ID, or None if it is not registered.
+    """
+    return self._idByObj.get(id(obj))
+
   def createScene(self, name, **args):
     """Create and start a new game scene.
 
-    Creates a scene using the SceneFactory, registers it with the engine,
+    Resolves the scene class through the SceneFactory once, reuses a
+    pooled instance or constructs a new one, registers it with the engine,
     adds the local player to the scene, and pushes it to the view stack.
 
     Args:
@@ -128,52 +170,91 @@ class SinglePlayerSession:
     Returns:
         Integer ID assigned to the created scene.
     """
-    import Log
-    Log.debug("SinglePlayerSession.createScene(%s) called" % name)
-    id = self.generateId()
-    scene = SceneFactory.create(
-      engine=self.engine,
-      name=name,
-      owner=self.id,
-      session=self,
-      **args
-    )
-    self.objects[id] = scene
-    self.scenes.append(scene)
-    self.engine.addTask(scene)
+    Log.debug("SinglePlayerSession.createScene(%s) called", name)
+    cls = SceneFactory.lookup(name)
+    scene = self._reuseScene(cls, args)
+    if scene is None:
+      scene = cls(engine=self.engine, owner=self.id, session=self, **args)
+    return self._registerScene(scene)
+
+  def _registerScene(self, scene):
+    """Register a newly created scene with the session, engine and view.
+
+    Args:
+        scene: The Scene instance to start.
+
+    Returns:
+        Integer ID assigned to the scene.
+    """
+    sceneId = next(self._nextIds)
+    engine = self.engine
+    self.objects[sceneId] = scene
+    self._idByObj[id(scene)] = sceneId
+    self.scenes[sceneId] = scene
+    engine.addTask(scene)
     
     # Enter the scene with the player
-    if self.player:
-      scene.addPlayer(self.player)
-      self.engine.view.pushLayer(scene)
+    player = self.player
+    if player is not None:
+      scene.addPlayer(player)
+      engine.view.pushLayer(scene)
+      self._pushedLayers.add(id(scene))
     
-    Log.debug("Scene created. Tasks: %d, Layers: %d" % (len(self.engine.tasks), len(self.engine.view.layers)))
-    return id
+    Log.debug("Scene created. Tasks: %d, Layers: %d", len(engine.tasks), len(engine.view.layers))
+    return sceneId
+
+  def _reuseScene(self, cls, args):
+    """Take a scene out of the pool and reset it, if one is available.
+
+    Scenes that are still fading out of the view are left in the pool.
+
+    Args:
+        cls: Scene class, as returned by SceneFactory.lookup().
+        args: Keyword arguments for the scene.
+
+    Returns:
+        The reset Scene instance, or None if there was nothing to reuse.
+    """
+    pool = self._scenePools.get(cls)
+    if not pool:
+      return None
+    layers = self.engine.view.layers
+    for i, scene in enumerate(pool):
+      if scene not in layers:
+        del pool[i]
+        scene.reset(engine=self.engine, owner=self.id, session=self, **args)
+        return scene
+    return None
 
   def deleteScene(self, scene):
     """Remove and clean up a scene.
 
-    Removes the scene from the active scenes list, unregisters it from
-    the engine task system, pops it from the view stack if present,
-    and removes it from the objects dictionary.
+    Removes the scene from the active scenes and objects dictionaries,
+    unregisters it from the engine task system and pops it from the
+    view stack if present.
 
     Args:
         scene: The Scene instance to remove.
     """
-    import Log
-    Log.debug("SinglePlayerSession.deleteScene() called for %s" % scene.__class__.__name__)
-    if scene in self.scenes:
-      self.scenes.remove(scene)
-      self.engine.removeTask(scene)
-      # Pop the scene from the view if it's a layer
-      if scene in self.engine.view.layers:
-        self.engine.view.popLayer(scene)
-      # Find and remove from objects
-      for id, obj in list(self.objects.items()):
-        if obj is scene:
-          del self.objects[id]
-          break
-    Log.debug("Tasks remaining: %d, Scenes remaining: %d" % (len(self.engine.tasks), len(self.scenes)))
+    Log.debug("SinglePlayerSession.deleteScene() called for %s", type(scene).__name__)
+    engine = self.engine
+    key = id(scene)
+    sceneId = self._idByObj.pop(key, None)
+    if sceneId is not None:
+      del self.scenes[sceneId]
+      del self.objects[sceneId]
+      engine.removeTask(scene)
+      # Pop the scene from the view if we pushed it
+      pushedLayers = self._pushedLayers
+      if key in pushedLayers:
+        pushedLayers.discard(key)
+        engine.view.popLayer(scene)
+      # Keep the instance around for the next scene of the same class
+      if scene.reusable:
+        pool = self._scenePools.setdefault(scene.__class__, [])
+        if len(pool) < SCENE_POOL_SIZE:
+          pool.append(scene)
+    Log.debug("Tasks remaining: %d, Scenes remaining: %d", len(engine.tasks), len(self.scenes))
 
   def startGame(self, libraryName=None, songName=None):
     """Start the game by creating the initial scene.
@@ -185,12 +266,12 @@ class SinglePlayerSession:
         libraryName: Optional name of the song library to open.
         songName: Optional name of the song to pre-select.
     """
-    args = {}
-    if libraryName:
-      args['libraryName'] = libraryName
-    if songName:
-      args['songName'] = songName
-    self.createScene(STARTUP_SCENE, **args)
+    Log.debug("SinglePlayerSession.startGame() called")
+    scene = self._reuseScene(self._startupFactory, {"libraryName": libraryName, "songName": songName})
+    if scene is None:
+      scene = self._startupFactory(engine=self.engine, owner=self.id, session=self,
+                                   libraryName=libraryName, songName=songName)
+    self._registerScene(scene)
 
   def finishGame(self):
     """End the current game and return to the main menu.
@@ -198,16 +279,27 @@ class SinglePlayerSession:
     Cleans up all active scenes, pops all view layers, and pushes
     the MainMenu layer onto the view stack.
     """
-    import Log
     Log.debug("SinglePlayerSession.finishGame() called")
-    # Clean up all scenes
-    for scene in list(self.scenes):
-      self.deleteScene(scene)
+    engine = self.engine
+    view = engine.view
+    # Clean up all scenes in one go; their layers are popped below
+    engine.removeTasks(list(self.scenes.values()))
+    self.scenes.clear()
+    self.objects.clear()
+    self._idByObj.clear()
+    self._pushedLayers.clear()
+    self._scenePools.clear()
     
+    # Let the next session reuse the player
+    if self.player and not _playerPool:
+      _playerPool.append(self.player)
+
     # Signal game finished
-    import MainMenu
-    self.engine.view.popAllLayers()
-    self.engine.view.pushLayer(MainMenu.MainMenu(self.engine))
+    global _MainMenu
+    if _MainMenu is None:
+      from MainMenu import MainMenu as _MainMenu
+    view.popAllLayers()
+    view.pushLayer(_MainMenu(engine))
 
   def close(self):
     """Close the session and release resources.
@@ -220,11 +312,12 @@ class SinglePlayerSession:
 
 class SinglePlayerGameTask:
   """
-  Engine task that manages a single-player game session.
+  Controller that manages a single-player game session.
 
-  Provides a task-based interface for the engine to manage the game
-  session lifecycle. The task runs every frame and can be used to
-  quit the game cleanly.
+  Provides a task-like interface for managing the game session lifecycle
+  and can be used to quit the game cleanly. All game logic lives in the
+  scenes, so this object has no per-frame work and is never scheduled by
+  the engine; it does not need to be passed to engine.addTask().
 
   Attributes:
       engine: Reference to the GameEngine instance.
@@ -232,6 +325,8 @@ class SinglePlayerGameTask:
       player: Reference to the local Player for convenience.
   """
 
+  __slots__ = ("engine", "session", "player")
+
   def __init__(self, engine, session):
     """Initialize the game task.
 
@@ -247,17 +342,7 @@ class SinglePlayerGameTask:
     """Quit the game session and return to the main menu.
 
     Calls finishGame() on the session and removes this task from
-    the engine's task list.
+    the engine's task list in case it was registered there.
     """
     self.session.finishGame()
     self.engine.removeTask(self)
-
-  def run(self, ticks):
-    """Execute one frame of the game task.
-
-    Currently a no-op as game logic is handled by individual scenes.
-
-    Args:
-        ticks: Number of milliseconds since the last frame.
-    """
-    pass
@@ -56,20 +56,26 @@ Typical usage::
 import midi
 import Log
 import Audio
-from configparser import ConfigParser
 import os
 import re
 import shutil
 import Config
 import hashlib
+import concurrent.futures
+import heapq
+import bisect
+import hmac
 import binascii
+import json
 import pickle
+import numpy
 # import Cerealizer
 import urllib.request, urllib.parse, urllib.error
 import Version
 import Theme
 from Language import _
-from functools import reduce
+from itertools import count
+from operator import itemgetter
 
 DEFAULT_LIBRARY         = "songs"
 
@@ -114,19 +120,117 @@ difficulties = {
   AMAZING_DIFFICULTY:  Difficulty(AMAZING_DIFFICULTY,  _("Amazing")),
 }
 
+# Marks a missing argument where None is a valid value
+_missing = object()
+
+class IniParser(object):
+  """
+  Minimal INI file reader and writer for song and library metadata.
+
+  Covers the subset of ConfigParser behavior that song.ini and library.ini
+  files use: sections, "key = value" or "key: value" pairs with
+  case-insensitive keys, full-line "#" and ";" comments, and indented
+  continuation lines. Values are never interpolated. The whole file is
+  read and split in one go, which makes scanning large song libraries
+  much faster than with ConfigParser.
+
+  Attributes:
+      sections: Dictionary mapping section names to dictionaries of
+          option names and string values, in file order.
+  """
+
+  sectionRe = re.compile(r"\[([^\]]+)\]")
+  optionRe  = re.compile(r"([^=:]+?)\s*[=:]\s*(.*)")
+
+  def __init__(self):
+    self.sections = {}
+
+  def read(self, fileName):
+    """Read and merge an INI file into this parser.
+
+    Args:
+        fileName: Path to the INI file.
+    """
+    f = open(fileName, "rb")
+    try:
+      data = f.read().decode("utf-8-sig", "replace")
+    finally:
+      f.close()
+
+    section = None
+    option  = None
+    for line in data.splitlines():
+      stripped = line.strip()
+      if not stripped or stripped[0] in "#;":
+        continue
+      # Continuation of a multi-line value
+      if line[0] in " \t" and option is not None:
+        section[option] += "\n" + stripped
+        continue
+      option = None
+      m = self.sectionRe.match(stripped)
+      if m:
+        section = self.sections.setdefault(m.group(1), {})
+        continue
+      m = self.optionRe.match(stripped)
+      if m and section is not None:
+        option = m.group(1).lower()
+        section[option] = m.group(2)
+
+  def has_section(self, section):
+    return section in self.sections
+
+  def add_section(self, section):
+    self.sections.setdefault(section, {})
+
+  def has_option(self, section, option):
+    return option.lower() in self.sections.get(section, ())
+
+  def get(self, section, option, fallback = _missing):
+    """Get a raw string value.
+
+    Args:
+        fallback: Value to return if the section or option does not exist.
+
+    Raises:
+        KeyError: If the section or option does not exist and no fallback
+            was given.
+    """
+    value = self.sections.get(section, {}).get(option.lower(), fallback)
+    if value is _missing:
+      raise KeyError(option)
+    return value
+
+  def set(self, section, option, value):
+    """Set a string value in an existing section.
+
+    Raises:
+        KeyError: If the section does not exist.
+    """
+    self.sections[section][option.lower()] = value
+
+  def write(self, f):
+    """Write the contents in INI format to an open text file."""
+    for section, options in self.sections.items():
+      f.write("[%s]\n" % section)
+      for option, value in options.items():
+        f.write("%s = %s\n" % (option, str(value).replace("\n", "\n\t")))
+      f.write("\n")
+
 class SongInfo(object):
   """
   Container for song metadata loaded from a song.ini file.
 
   Manages all song information including name, artist, highscores,
   delay settings, and available difficulties. Highscores are stored
-  with SHA1 hash verification to prevent tampering.
+  as JSON signed with an HMAC to prevent tampering.
 
   Attributes:
       songName: Directory name of the song (used as identifier).
       fileName: Full path to the song.ini file.
-      info: ConfigParser instance for reading/writing INI data.
-      highScores: Dictionary mapping Difficulty to list of (score, stars, name) tuples.
+      info: IniParser instance for reading/writing INI data.
+      highScores: Dictionary mapping Difficulty to list of (score, stars, name) tuples,
+          decoded from the song.ini on first access.
       tutorial: Boolean property indicating if this is a tutorial song.
       name: Song title from metadata.
       artist: Artist name from metadata.
@@ -135,6 +239,12 @@ class SongInfo(object):
       cassetteColor: Theme color for the song's cassette representation.
   """
 
+  # There ain't no security like security throught obscurity :)
+  scoreKey = b"Frets on Fire highscores"
+
+  # Older versions saved a hex encoded pickle, sometimes wrapped in a bytes repr
+  legacyScoresRe = re.compile(r"b?'?([0-9a-fA-F]+)'?")
+
   def __init__(self, infoFileName):
     """Initialize SongInfo from a song.ini file.
 
@@ -143,35 +253,67 @@ class SongInfo(object):
     """
     self.songName      = os.path.basename(os.path.dirname(infoFileName))
     self.fileName      = infoFileName
-    self.info          = ConfigParser()
+    self.info          = IniParser()
     self._difficulties = None
 
     try:
       self.info.read(infoFileName)
     except:
       pass
-      
-    # Read highscores and verify their hashes.
-    # There ain't no security like security throught obscurity :)
-    self.highScores = {}
-    
-    scores = self._get("scores", str, "")
-    if scores:
-      try:
-        scores = pickle.loads(binascii.unhexlify(scores))
-        for difficulty in list(scores.keys()):
-          try:
-            difficulty = difficulties[difficulty]
-          except KeyError:
-            continue
-          for score, stars, name, hash in scores[difficulty.id]:
-            if self.getScoreHash(difficulty, score, stars, name) == hash:
+
+    # Highscores are decoded when first needed, see highScores
+    self._highScores = None
+
+  def _getHighScores(self):
+    # Read highscores and verify their signature
+    if self._highScores is None:
+      self._highScores = {}
+      scores = self._get("scores", str, "")
+      if scores:
+        try:
+          for difficulty, entries in self._decodeScores(scores):
+            for score, stars, name in entries:
               self.addHighscore(difficulty, score, stars, name)
-            else:
-              Log.warn("Weak hack attempt detected. Better luck next time.")
-      except Exception as e:
-        # Could not load old scores (likely old serialization format)
-        Log.warn("Could not load saved scores: %s" % str(e))
+        except Exception as e:
+          Log.warn("Could not load saved scores: %s" % str(e))
+    return self._highScores
+
+  def _decodeScores(self, scores):
+    """Return (difficulty, entries) pairs for a stored scores string."""
+    legacy = self.legacyScoresRe.fullmatch(scores)
+    if legacy:
+      return self._decodeLegacyScores(legacy.group(1))
+
+    data = binascii.a2b_base64(scores)
+    if len(data) <= 21 or data[-21:-20] != b"|":
+      raise ValueError("Malformed scores")
+
+    payload, digest = data[:-21], data[-20:]
+    if not hmac.compare_digest(digest, hmac.new(self.scoreKey, payload, "sha1").digest()):
+      Log.warn("Weak hack attempt detected. Better luck next time.")
+      return []
+
+    result = []
+    for id, entries in json.loads(payload.decode("utf-8")).items():
+      if int(id) in difficulties:
+        result.append((difficulties[int(id)], [tuple(e) for e in entries]))
+    return result
+
+  def _decodeLegacyScores(self, scores):
+    """Decode the hex encoded pickle older versions saved, checking each score hash."""
+    result = []
+    for id, entries in pickle.loads(binascii.unhexlify(scores)).items():
+      if id not in difficulties:
+        continue
+      difficulty = difficulties[id]
+      verified   = []
+      for score, stars, name, hash in entries:
+        if self.getScoreHash(difficulty, score, stars, name) == hash:
+          verified.append((score, stars, name))
+        else:
+          Log.warn("Weak hack attempt detected. Better luck next time.")
+      result.append((difficulty, verified))
+    return result
 
   def _set(self, attr, value):
     if not self.info.has_section("song"):
@@ -182,10 +324,10 @@ class SongInfo(object):
     self.info.set("song", attr, value)
     
   def getObfuscatedScores(self):
-    s = {}
-    for difficulty in list(self.highScores.keys()):
-      s[difficulty.id] = [(score, stars, name, self.getScoreHash(difficulty, score, stars, name)) for score, stars, name in self.highScores[difficulty]]
-    return binascii.hexlify(pickle.dumps(s))
+    s = dict((difficulty.id, scores) for difficulty, scores in self.highScores.items())
+    payload = json.dumps(s, separators = (",", ":")).encode("utf-8")
+    digest  = hmac.new(self.scoreKey, payload, "sha1").digest()
+    return binascii.b2a_base64(payload + b"|" + digest, newline = False).decode("ascii")
 
   def save(self):
     self._set("scores", self.getObfuscatedScores())
@@ -195,10 +337,7 @@ class SongInfo(object):
     f.close()
     
   def _get(self, attr, type = None, default = ""):
-    try:
-      v = self.info.get("song", attr)
-    except:
-      v = default
+    v = self.info.get("song", attr, fallback = default)
     if v is not None and type:
       v = type(v)
     return v
@@ -208,7 +347,8 @@ class SongInfo(object):
 
     Parses the MIDI note file to determine which difficulties have notes.
     Tutorial songs only return MEDIUM_DIFFICULTY. Results are cached
-    after first call.
+    after first call, and on disk in notes.mid.diffcache keyed by the
+    note file's modification time and size.
 
     Returns:
         List of Difficulty objects available for this song, sorted by
@@ -224,14 +364,22 @@ class SongInfo(object):
     # See which difficulties are available
     try:
       noteFileName = os.path.join(os.path.dirname(self.fileName), "notes.mid")
-      info = MidiInfoReader()
-      midiIn = midi.MidiInFile(info, noteFileName)
-      try:
-        midiIn.read()
-      except MidiInfoReader.Done:
-        pass
-      info.difficulties.sort(key=lambda x: x.id, reverse=True)
-      self._difficulties = info.difficulties
+      ids = self._readDifficultyCache(noteFileName)
+      if ids is None:
+        with open(noteFileName, "rb") as f:
+          found = scanDifficulties(f.read())
+        # Fall back to the full parser for anything unusual
+        if found is None:
+          info = MidiInfoReader()
+          midiIn = midi.MidiInFile(info, noteFileName)
+          try:
+            midiIn.read()
+          except MidiInfoReader.Done:
+            pass
+          found = [d.id for d in info.difficulties]
+        ids = sorted(found, reverse = True)
+        self._writeDifficultyCache(noteFileName, ids)
+      self._difficulties = [difficulties[i] for i in ids]
     except:
       self._difficulties = list(difficulties.values())
     
@@ -241,6 +389,40 @@ class SongInfo(object):
     
     return self._difficulties
 
+  def _difficultyCacheKey(self, noteFileName):
+    st = os.stat(noteFileName)
+    return (st.st_mtime_ns, st.st_size)
+
+  def _readDifficultyCache(self, noteFileName):
+    """Return the cached difficulty ids for a note file, or None if stale or unreadable."""
+    try:
+      key = self._difficultyCacheKey(noteFileName)
+      with open(noteFileName + ".diffcache", "rb") as f:
+        cache = json.loads(f.read().decode("utf-8"))
+    except (OSError, ValueError):
+      return None
+    # The file lives in the song folder, so anything that is not exactly
+    # {"key": [mtime, size], "difficulties": [id, ...]} counts as a miss
+    if not isinstance(cache, dict) or cache.get("key") != list(key):
+      return None
+    ids = cache.get("difficulties")
+    if not isinstance(ids, list) or not all(type(i) is int and i in difficulties for i in ids):
+      return None
+    return ids
+
+  def _writeDifficultyCache(self, noteFileName, ids):
+    """Store the difficulty ids next to the note file, if it is writable."""
+    cacheFileName = noteFileName + ".diffcache"
+    tmpFileName = cacheFileName + ".tmp"
+    try:
+      key = self._difficultyCacheKey(noteFileName)
+      cache = {"key": list(key), "difficulties": list(ids)}
+      with open(tmpFileName, "wb") as f:
+        f.write(json.dumps(cache, separators = (",", ":")).encode("utf-8"))
+      os.replace(tmpFileName, cacheFileName)
+    except OSError as e:
+      Log.debug("Unable to write difficulty cache %s: %s", cacheFileName, e)
+
   def getName(self):
     return self._get("name")
 
@@ -262,7 +444,8 @@ class SongInfo(object):
     self._set("artist", value)
     
   def getScoreHash(self, difficulty, score, stars, name):
-    return hashlib.sha1(("%d%d%d%s" % (difficulty.id, score, stars, name)).encode('utf-8')).hexdigest()
+    """Per-score SHA1 used by the legacy score format."""
+    return hashlib.sha1(b"%d%d%d" % (difficulty.id, score, stars) + name.encode("utf-8")).hexdigest()
     
   def getDelay(self):
     return self._get("delay", int, 0)
@@ -271,10 +454,7 @@ class SongInfo(object):
     return self._set("delay", value)
     
   def getHighscores(self, difficulty):
-    try:
-      return self.highScores[difficulty]
-    except KeyError:
-      return []
+    return self.highScores.get(difficulty, [])
 
   def uploadHighscores(self, url, songHash):
     try:
@@ -309,17 +489,17 @@ class SongInfo(object):
     Returns:
         Integer position (0-4) if score made top 5, -1 otherwise.
     """
-    if not difficulty in self.highScores:
-      self.highScores[difficulty] = []
-    self.highScores[difficulty].append((score, stars, name))
-    # Sort by score descending (Python 3 uses key= instead of cmp=)
-    self.highScores[difficulty].sort(key=lambda x: -x[0])
-    self.highScores[difficulty] = self.highScores[difficulty][:5]
-    for i, scores in enumerate(self.highScores[difficulty]):
-      _score, _stars, _name = scores
-      if _score == score and _stars == stars and _name == name:
-        return i
-    return -1
+    scores = self.highScores.setdefault(difficulty, [])
+
+    # The list is kept sorted by score descending; equal scores keep their order
+    i = len(scores)
+    while i > 0 and scores[i - 1][0] < score:
+      i -= 1
+    if i >= 5:
+      return -1
+    scores.insert(i, (score, stars, name))
+    del scores[5:]
+    return i
 
   def isTutorial(self):
     return self._get("tutorial", int, 0) == 1
@@ -330,12 +510,13 @@ class SongInfo(object):
   tutorial      = property(isTutorial)
   difficulties  = property(getDifficulties)
   cassetteColor = property(getCassetteColor, setCassetteColor)
+  highScores    = property(_getHighScores)
 
 class LibraryInfo(object):
   def __init__(self, libraryName, infoFileName):
     self.libraryName   = libraryName
     self.fileName      = infoFileName
-    self.info          = ConfigParser()
+    self.info          = IniParser()
     self.songCount     = 0
 
     try:
@@ -349,18 +530,17 @@ class LibraryInfo(object):
 
     # Count the available songs
     libraryRoot = os.path.dirname(self.fileName)
-    for name in os.listdir(libraryRoot):
-      if not os.path.isdir(os.path.join(libraryRoot, name)) or name.startswith("."):
-        continue
-      if os.path.isfile(os.path.join(libraryRoot, name, "song.ini")):
-        self.songCount += 1
+    with os.scandir(libraryRoot) as entries:
+      for entry in entries:
+        if entry.name.startswith(".") or not entry.is_dir():
+          continue
+        if os.path.isfile(os.path.join(entry.path, "song.ini")):
+          self.songCount += 1
 
   def _set(self, attr, value):
     if not self.info.has_section("library"):
       self.info.add_section("library")
-    if type(value) == str:
-      value = value.encode(Config.encoding)
-    else:
+    if not isinstance(value, str):
       value = str(value)
     self.info.set("library", attr, value)
     
@@ -370,10 +550,7 @@ class LibraryInfo(object):
     f.close()
     
   def _get(self, attr, type = None, default = ""):
-    try:
-      v = self.info.get("library", attr)
-    except:
-      v = default
+    v = self.info.get("library", attr, fallback = default)
     if v is not None and type:
       v = type(v)
     return v
@@ -475,11 +652,11 @@ class Track:
   Container for events at a specific difficulty level.
 
   Tracks store notes and other events with efficient time-based retrieval
-  using a granular bucket system. Each track corresponds to one difficulty.
+  using a sorted index of granular time buckets. Each track corresponds
+  to one difficulty.
 
   Attributes:
       granularity: Time bucket size in milliseconds for event indexing.
-      events: List of event buckets for fast time-range queries.
       allEvents: List of all (time, event) tuples in insertion order.
   """
 
@@ -487,66 +664,74 @@ class Track:
   
   def __init__(self):
     """Initialize an empty Track."""
-    self.events = []
     self.allEvents = []
+    self._index    = None
 
   def addEvent(self, time, event):
     """Add an event to the track at the specified time.
 
-    Events are indexed into time buckets based on granularity for
-    efficient range queries. Long events span multiple buckets.
+    The time index is rebuilt on the next query.
 
     Args:
         time: Start time in milliseconds.
         event: Event object to add (Note, Tempo, TextEvent, etc.).
     """
-    for t in range(int(time / self.granularity), int((time + event.length) / self.granularity) + 1):
-      if len(self.events) < t + 1:
-        n = t + 1 - len(self.events)
-        n *= 8
-        self.events = self.events + [[] for n in range(n)]
-      self.events[t].append((time - (t * self.granularity), event))
     self.allEvents.append((time, event))
+    self._index = None
 
   def removeEvent(self, time, event):
-    for t in range(int(time / self.granularity), int((time + event.length) / self.granularity) + 1):
-      e = (time - (t * self.granularity), event)
-      if t < len(self.events) and e in self.events[t]:
-        self.events[t].remove(e)
-    if (time, event) in self.allEvents:
+    try:
       self.allEvents.remove((time, event))
+    except ValueError:
+      return
+    self._index = None
+
+  def _buildIndex(self):
+    """Sort the events by time and compute the buckets each one spans."""
+    events  = sorted(self.allEvents, key = itemgetter(0))
+    times   = numpy.fromiter((t for t, e in events), dtype = numpy.float64, count = len(events))
+    lengths = numpy.fromiter((e.length for t, e in events), dtype = numpy.float64, count = len(events))
+    starts  = numpy.trunc(times / self.granularity).astype(numpy.int32)
+    ends    = numpy.trunc((times + lengths) / self.granularity).astype(numpy.int32)
+    maxSpan = int((ends - starts).max()) if events else 0
+    self._index = (starts, ends, maxSpan, events)
 
   def getEvents(self, startTime, endTime):
     """Retrieve all events within a time range.
 
-    Uses the granular bucket index for efficient lookups.
+    Binary searches the sorted bucket index, so the cost depends on the
+    number of events returned rather than the length of the range.
 
     Args:
         startTime: Start of time range in milliseconds.
         endTime: End of time range in milliseconds.
 
     Returns:
-        Set of (time, event) tuples for events active in the range.
+        List of (time, event) tuples for events active in the range.
     """
+    if self._index is None:
+      self._buildIndex()
+    starts, ends, maxSpan, events = self._index
+
     t1, t2 = [int(x) for x in [startTime / self.granularity, endTime / self.granularity]]
     if t1 > t2:
       t1, t2 = t2, t1
+    t1 = max(t1, 0)
+    if t1 >= t2:
+      return []
 
-    events = set()
-    for t in range(max(t1, 0), min(len(self.events), t2)):
-      for diff, event in self.events[t]:
-        time = (self.granularity * t) + diff
-        events.add((time, event))
-    return events
+    # Events starting in the range, plus long ones reaching into it
+    lo = starts.searchsorted(t1 - maxSpan, "left")
+    hi = starts.searchsorted(t2, "left")
+    return [events[i] for i in numpy.flatnonzero(ends[lo:hi] >= t1) + lo]
 
   def getAllEvents(self):
     return self.allEvents
 
   def reset(self):
-    for eventList in self.events:
-      for time, event in eventList:
-        if isinstance(event, Note):
-          event.played = False
+    for time, event in self.allEvents:
+      if isinstance(event, Note):
+        event.played = False
 
   def update(self):
     """Update track state, marking tappable notes.
@@ -566,68 +751,64 @@ class Track:
     #  2. Previous note not the same as this one
     #  3. Previous note not a chord
     #  4. Previous note ends at most 161 ticks before this one
-    bpm             = None
     ticksPerBeat    = 480
     tickThreshold   = 161
-    prevNotes       = []
-    currentNotes    = []
-    currentTicks    = 0.0
-    prevTicks       = 0.0
     epsilon         = 1e-3
 
-    def beatsToTicks(time):
-      return (time * bpm * ticksPerBeat) / 60000.0
+    # Gather the notes along with the tempo in effect at each one
+    notes      = []
+    times      = []
+    bpms       = [numpy.nan]
+    tempoIndex = []
+    # Note and Tempo have no subclasses, so compare types directly
+    for time, event in self.allEvents:
+      kind = type(event)
+      if kind is Tempo:
+        bpms.append(event.bpm)
+      elif kind is Note:
+        # All notes are initially not tappable
+        event.tappable = False
+        notes.append(event)
+        times.append(time)
+        tempoIndex.append(len(bpms) - 1)
 
-    if not self.allEvents:
+    if not notes:
       return
 
-    for time, event in self.allEvents + [self.allEvents[-1]]:
-      if isinstance(event, Tempo):
-        bpm = event.bpm
-      elif isinstance(event, Note):
-        # All notes are initially not tappable
-        event.tappable = False
-        ticks = beatsToTicks(time)
-        
-        # Part of chord?
-        if ticks < currentTicks + epsilon:
-          currentNotes.append(event)
-          continue
-        
-        """
-        for i in range(5):
-          if i in [n.number for n in prevNotes]:
-            print " # ",
-          else:
-            print " . ",
-        print " | ",
-        for i in range(5):
-          if i in [n.number for n in currentNotes]:
-            print " # ",
-          else:
-            print " . ",
-        print
-        """
-
-        # Previous note not a chord?
-        if len(prevNotes) == 1:
-          # Previous note ended recently enough?
-          prevEndTicks = prevTicks + beatsToTicks(prevNotes[0].length)
-          if currentTicks - prevEndTicks <= tickThreshold:
-            for note in currentNotes:
-              # Are any current notes the same as the previous one?
-              if note.number == prevNotes[0].number:
-                break
-            else:
-              # If all the notes are different, mark the current notes tappable
-              for note in currentNotes:
-                note.tappable = True
-
-        # Set the current notes as the previous notes
-        prevNotes    = currentNotes
-        prevTicks    = currentTicks
-        currentNotes = [event]
-        currentTicks = ticks
+    scale   = numpy.array(bpms)[tempoIndex] * ticksPerBeat / 60000.0
+    ticks   = numpy.array(times, dtype = numpy.float64) * scale
+    lengths = numpy.fromiter((n.length for n in notes), dtype = numpy.float64, count = len(notes))
+    numbers = numpy.fromiter((n.number for n in notes), dtype = numpy.int64, count = len(notes))
+
+    # A note starts a new chord once it is past everything before it. Group
+    # zero collects any notes at the very start of the track.
+    prevMax    = numpy.fmax.accumulate(numpy.concatenate(([0.0], ticks[:-1])))
+    firstNotes = numpy.flatnonzero(ticks >= prevMax + epsilon)
+    group      = numpy.zeros(len(notes), dtype = numpy.int64)
+    group[firstNotes] = 1
+    group      = numpy.cumsum(group)
+    groups     = len(firstNotes) + 1
+    groupFirst = numpy.concatenate(([0], firstNotes))
+    groupTicks = numpy.concatenate(([0.0], ticks[firstNotes]))
+    groupSize  = numpy.bincount(group, minlength = groups)
+
+    # A chord is judged when the next one begins, so the last is never tappable
+    g         = numpy.arange(1, groups - 1)
+    prev      = groupFirst[g - 1]
+    prevEnd   = groupTicks[g - 1] + lengths[prev] * scale[groupFirst[g + 1]]
+    tappable  = (groupSize[g - 1] == 1) & (groupTicks[g] - prevEnd <= tickThreshold)
+
+    # Are any current notes the same as the previous one?
+    prevNumber    = numpy.full(groups, -1, dtype = numpy.int64)
+    prevNumber[g] = numbers[prev]
+    repeats       = numpy.bincount(group, weights = numbers == prevNumber[group], minlength = groups)
+    tappable     &= repeats[g] == 0
+
+    # Mark the current notes of every tappable chord
+    groupTappable    = numpy.zeros(groups, dtype = bool)
+    groupTappable[g] = tappable
+    for i in numpy.flatnonzero(groupTappable[group]):
+      notes[i].tappable = True
 
 class Song(object):
   """
@@ -641,6 +822,7 @@ class Song(object):
       engine: Game engine reference for resource access.
       info: SongInfo object with metadata.
       tracks: List of Track objects, one per difficulty level.
+      scriptTrack: Track of text and picture events shared by all difficulties.
       difficulty: Currently selected Difficulty object.
       bpm: Beats per minute for timing calculations.
       period: Milliseconds per beat (60000 / bpm).
@@ -666,6 +848,7 @@ class Song(object):
     self.engine        = engine
     self.info          = SongInfo(infoFileName)
     self.tracks        = [Track() for t in range(len(difficulties))]
+    self.scriptTrack   = Track()
     self.difficulty    = difficulties[AMAZING_DIFFICULTY]
     self._playing      = False
     self.start         = 0.0
@@ -674,8 +857,9 @@ class Song(object):
     self.period        = 0
 
     # load the tracks
+    self.music       = None
     if songTrackName:
-      self.music       = Audio.Music(songTrackName)
+      self.music     = Audio.Music(songTrackName)
 
     self.guitarTrack = None
     self.rhythmTrack = None
@@ -694,27 +878,23 @@ class Song(object):
 	
     # load the notes
     if noteFileName:
-      midiIn = midi.MidiInFile(MidiReader(self), noteFileName)
-      midiIn.read()
+      MidiReader(self).read(noteFileName)
 
     # load the script
     if scriptFileName and os.path.isfile(scriptFileName):
-      scriptReader = ScriptReader(self, open(scriptFileName))
-      scriptReader.read()
+      with open(scriptFileName) as f:
+        ScriptReader(self, f).read()
 
     # update all note tracks
     for track in self.tracks:
       track.update()
 
   def getHash(self):
-    h = hashlib.sha1()
-    f = open(self.noteFileName, "rb")
-    bs = 1024
-    while True:
-      data = f.read(bs)
-      if not data: break
-      h.update(data)
-    return h.hexdigest()
+    with open(self.noteFileName, "rb") as f:
+      if hasattr(hashlib, "file_digest"):
+        return hashlib.file_digest(f, "sha1").hexdigest()
+      # Python < 3.11: note files are small, so hash them in one call
+      return hashlib.sha1(f.read()).hexdigest()
   
   def setBpm(self, bpm):
     self.bpm    = bpm
@@ -845,6 +1025,14 @@ noteMap = {     # difficulty, note
 
 reverseNoteMap = dict([(v, k) for k, v in list(noteMap.items())])
 
+# Flat versions of the maps above: noteTable is indexed by MIDI pitch and
+# reverseNoteTable by difficulty * 5 + fret number
+noteTable        = [None] * 256
+reverseNoteTable = [0] * (len(difficulties) * 5)
+for pitch, (difficulty, number) in noteMap.items():
+  noteTable[pitch] = (difficulty, number)
+  reverseNoteTable[difficulty * 5 + number] = pitch
+
 class MidiWriter:
   """
   Writes song note data to a MIDI file.
@@ -881,34 +1069,32 @@ class MidiWriter:
     else:
       self.out.tempo(int(60.0 * 10.0**6 / 122.0))
 
-    # Collect all events
-    events = [list(zip([difficulty] * len(track.getAllEvents()), track.getAllEvents())) for difficulty, track in enumerate(self.song.tracks)]
-    events = reduce(lambda a, b: a + b, events)
-    # Sort by time ascending (Python 3 uses key= instead of cmp=)
-    events.sort(key=lambda x: x[1][0])
+    # Merge the tracks in time order. Each track is sorted on its own and
+    # ties go to the lower difficulty, the same order as one stable sort.
+    events = heapq.merge(*[[(time, difficulty, event) for time, event in sorted(track.getAllEvents(), key = itemgetter(0))]
+                           for difficulty, track in enumerate(self.song.tracks)], key = itemgetter(0))
+    # Held notes as a heap of (endTime, order, note)
     heldNotes = []
+    order     = count()
 
-    for difficulty, event in events:
-      time, event = event
+    for time, difficulty, event in events:
       if isinstance(event, Note):
         time = self.midiTime(time)
 
         # Turn of any held notes that were active before this point in time
-        for note, endTime in list(heldNotes):
-          if endTime <= time:
-            self.out.update_time(endTime, relative = 0)
-            self.out.note_off(0, note)
-            heldNotes.remove((note, endTime))
+        while heldNotes and heldNotes[0][0] <= time:
+          endTime, seq, note = heapq.heappop(heldNotes)
+          self.out.update_time(endTime, relative = 0)
+          self.out.note_off(0, note)
 
-        note = reverseNoteMap[(difficulty, event.number)]
+        note = reverseNoteTable[difficulty * 5 + event.number]
         self.out.update_time(time, relative = 0)
         self.out.note_on(0, note, event.special and 127 or 100)
-        heldNotes.append((note, time + self.midiTime(event.length)))
-        # Sort by endTime ascending (Python 3 uses key= instead of cmp=)
-        heldNotes.sort(key=lambda x: x[1])
+        heapq.heappush(heldNotes, (time + self.midiTime(event.length), next(order), note))
 
     # Turn of any remaining notes
-    for note, endTime in heldNotes:
+    while heldNotes:
+      endTime, seq, note = heapq.heappop(heldNotes)
       self.out.update_time(endTime, relative = 0)
       self.out.note_off(0, note)
       
@@ -922,10 +1108,14 @@ class ScriptReader:
     self.song = song
     self.file = scriptFile
 
+  fieldRe = re.compile("[\t ]+")
+
   def read(self):
-    for line in self.file:
+    split  = self.fieldRe.split
+    track  = self.song.scriptTrack
+    for line in self.file.read().splitlines():
       if line.startswith("#"): continue
-      time, length, type, data = re.split("[\t ]+", line.strip(), 3)
+      time, length, type, data = split(line.strip(), 3)
       time   = float(time)
       length = float(length)
 
@@ -936,8 +1126,7 @@ class ScriptReader:
       else:
         continue
 
-      for track in self.song.tracks:
-        track.addEvent(time, event)
+      track.addEvent(time, event)
 
 class MidiReader(midi.MidiOutStream):
   """
@@ -949,10 +1138,15 @@ class MidiReader(midi.MidiOutStream):
 
   Attributes:
       song: Song object to populate with parsed events.
-      heldNotes: Dict tracking currently held notes for note-off matching.
-      velocity: Dict storing note velocities for special note detection.
+      heldNotes: Start of each held note for note-off matching, indexed by
+          track << 12 | channel << 8 | pitch.
+      velocity: Last note-on velocity of each pitch for special note detection.
       ticksPerBeat: MIDI time resolution from file header.
-      tempoMarkers: List of (tick, bpm) tuples for tempo changes.
+      markerTicks: Tick of each tempo change, in the order they were read.
+      markerBpms: BPM set by each tempo change.
+
+  Event times are worked out in one batch once the whole file has been
+  read, see eof().
   """
 
   def __init__(self, song):
@@ -963,10 +1157,52 @@ class MidiReader(midi.MidiOutStream):
     """
     midi.MidiOutStream.__init__(self)
     self.song = song
-    self.heldNotes = {}
-    self.velocity  = {}
+    self.heldNotes = [None] * 8192
+    self.velocity  = bytearray(256)
     self.ticksPerBeat = 480
-    self.tempoMarkers = []
+    self.markerTicks  = []
+    self.markerBpms   = []
+    self._markerTimes = []
+    self._markersSorted = True
+    # (track, event, startTick, startMarkers, endTick, endMarkers) for every
+    # event read so far; the times are converted in eof()
+    self._pending = []
+
+  def read(self, fileName):
+    """Parse a MIDI file into the song.
+
+    Well-formed files are decoded with iterMidiEvents() and fed straight to
+    the event handlers; anything else goes through midi.MidiInFile.
+
+    Args:
+        fileName: Path to the MIDI file.
+    """
+    with open(fileName, "rb") as f:
+      data = f.read()
+    try:
+      events = list(iterMidiEvents(data))
+    except (ValueError, IndexError):
+      midi.MidiInFile(self, fileName).read()
+      return
+
+    # The track and tick go straight to the note handlers instead of
+    # through the stream state. Only the first two tracks have notes we use.
+    self.header(*readMidiHeader(data))
+    noteOn  = self._noteOn
+    noteOff = self._noteOff
+    for track, tick, status, pitch, velocity in events:
+      if status == 0xff:
+        self.set_current_track(track)
+        self.update_time(tick, relative = 0)
+        self.tempo(pitch)
+      elif track > 1:
+        continue
+      elif status & 0xf0 == 0x90 and velocity:
+        noteOn(track, tick, status & 0x0f, pitch, velocity)
+      else:
+        # A note-on with zero velocity is a note-off
+        noteOff(track, tick, status & 0x0f, pitch)
+    self.eof()
 
   def addEvent(self, track, event, time = None):
     if time is None:
@@ -978,56 +1214,121 @@ class MidiReader(midi.MidiOutStream):
     elif track < len(self.song.tracks):
       self.song.tracks[track].addEvent(time, event)
 
+  def ticksToTime(self, ticks, bpm):
+    return (60000.0 * ticks) / (bpm * self.ticksPerBeat)
+
+  def _markerIndex(self, tick, count):
+    """Number of the first count tempo markers at or before the given tick."""
+    if self._markersSorted:
+      return min(bisect.bisect_right(self.markerTicks, tick), count)
+    return next((i for i, t in enumerate(self.markerTicks[:count]) if t > tick), count)
+
   def abs_time(self):
-    def ticksToBeats(ticks, bpm):
-      return (60000.0 * ticks) / (bpm * self.ticksPerBeat)
-      
+    return self._scaledTime(midi.MidiOutStream.abs_time(self))
+
+  def _scaledTime(self, currentTime):
+    """Song time in milliseconds of a tick with the tempo markers read so far."""
     if self.song.bpm:
-      currentTime = midi.MidiOutStream.abs_time(self)
-
-      # Find out the current scaled time.
-      # Yeah, this is reeally slow, but fast enough :)
-      scaledTime      = 0.0
-      tempoMarkerTime = 0.0
-      currentBpm      = self.song.bpm
-      for i, marker in enumerate(self.tempoMarkers):
-        time, bpm = marker
-        if time > currentTime:
-          break
-        scaledTime += ticksToBeats(time - tempoMarkerTime, currentBpm)
-        tempoMarkerTime, currentBpm = time, bpm
-      return scaledTime + ticksToBeats(currentTime - tempoMarkerTime, currentBpm)
+      # Find the last tempo marker at or before the current tick. The tick
+      # count restarts on every track, so this can go backwards.
+      i = self._markerIndex(currentTime, len(self.markerTicks))
+      if not i:
+        return self.ticksToTime(currentTime - 0.0, self.song.bpm)
+      return self._markerTimes[i - 1] + self.ticksToTime(currentTime - self.markerTicks[i - 1], self.markerBpms[i - 1])
     return 0.0
 
+  def ticksToTimes(self, ticks, counts):
+    """Convert a batch of MIDI ticks to milliseconds.
+
+    Gives the same results as calling abs_time() when each tick was read.
+
+    Args:
+        ticks: Sequence of absolute tick positions within their track.
+        counts: Number of tempo markers that had been read at each tick.
+
+    Returns:
+        Numpy array of times in milliseconds.
+    """
+    ticks  = numpy.asarray(ticks, dtype = numpy.int64)
+    counts = numpy.asarray(counts, dtype = numpy.int64)
+    if not self.markerTicks:
+      return numpy.zeros(len(ticks))
+
+    markerTicks = numpy.array(self.markerTicks, dtype = numpy.int64)
+    if self._markersSorted:
+      i = numpy.minimum(markerTicks.searchsorted(ticks, "right"), counts)
+    else:
+      i = numpy.array([self._markerIndex(t, c) for t, c in zip(ticks.tolist(), counts.tolist())], dtype = numpy.int64)
+
+    # Segment i starts at marker i - 1, or at the beginning of the song
+    baseTicks = numpy.concatenate(([0], markerTicks))[i]
+    baseTimes = numpy.concatenate(([0.0], self._markerTimes))[i]
+    bpms      = numpy.array([self.song.bpm] + self.markerBpms)[i]
+    times     = baseTimes + (60000.0 * (ticks - baseTicks)) / (bpms * self.ticksPerBeat)
+    times[counts == 0] = 0.0
+    return times
+
   def header(self, format, nTracks, division):
     self.ticksPerBeat = division
     
   def tempo(self, value):
-    bpm = 60.0 * 10.0**6 / value
-    self.tempoMarkers.append((midi.MidiOutStream.abs_time(self), bpm))
+    bpm  = 60.0 * 10.0**6 / value
+    tick = midi.MidiOutStream.abs_time(self)
     if not self.song.bpm:
       self.song.setBpm(bpm)
-    self.addEvent(None, Tempo(bpm))
+
+    # Keep the scaled time at each marker so abs_time() does not have to
+    # sum up every tempo change before the current tick
+    if self.markerTicks:
+      prevTick = self.markerTicks[-1]
+      self._markerTimes.append(self._markerTimes[-1] + self.ticksToTime(tick - prevTick, self.markerBpms[-1]))
+      self._markersSorted = self._markersSorted and tick >= prevTick
+    else:
+      self._markerTimes.append(self.ticksToTime(tick - 0.0, self.song.bpm))
+    self.markerTicks.append(tick)
+    self.markerBpms.append(bpm)
+    self._pending.append((None, Tempo(bpm), tick, len(self.markerTicks), tick, len(self.markerTicks)))
 
   def note_on(self, channel, note, velocity):
-    if self.get_current_track() > 1: return
-    self.velocity[note] = velocity
-    self.heldNotes[(self.get_current_track(), channel, note)] = self.abs_time()
+    self._noteOn(self.get_current_track(), midi.MidiOutStream.abs_time(self), channel, note, velocity)
 
   def note_off(self, channel, note, velocity):
-    if self.get_current_track() > 1: return
-    try:
-      startTime = self.heldNotes[(self.get_current_track(), channel, note)]
-      endTime   = self.abs_time()
-      del self.heldNotes[(self.get_current_track(), channel, note)]
-      if note in noteMap:
-        track, number = noteMap[note]
-        self.addEvent(track, Note(number, endTime - startTime, special = self.velocity[note] == 127), time = startTime)
-      else:
-        #Log.warn("MIDI note 0x%x at %d does not map to any game note." % (note, self.abs_time()))
-        pass
-    except KeyError:
-      Log.warn("MIDI note 0x%x on channel %d ending at %d was never started." % (note, channel, self.abs_time()))
+    self._noteOff(self.get_current_track(), midi.MidiOutStream.abs_time(self), channel, note)
+
+  def _noteOn(self, track, tick, channel, note, velocity):
+    if track > 1: return
+    self.velocity[note] = velocity
+    self.heldNotes[(track << 12) | (channel << 8) | note] = (tick, len(self.markerTicks))
+
+  def _noteOff(self, track, tick, channel, note):
+    if track > 1: return
+    key  = (track << 12) | (channel << 8) | note
+    held = self.heldNotes[key]
+    if held is None:
+      Log.warn("MIDI note 0x%x on channel %d ending at %d was never started." % (note, channel, self._scaledTime(tick)))
+      return
+    self.heldNotes[key] = None
+
+    mapping = noteTable[note]
+    if mapping:
+      difficulty, number = mapping
+      startTick, startCount = held
+      self._pending.append((difficulty, Note(number, 0.0, special = self.velocity[note] == 127),
+                            startTick, startCount, tick, len(self.markerTicks)))
+
+  def eof(self):
+    # Convert the times of all the events in one go and add them in the
+    # order they were read
+    pending = self._pending
+    self._pending = []
+    if not pending:
+      return
+    starts = self.ticksToTimes([p[2] for p in pending], [p[3] for p in pending]).tolist()
+    ends   = self.ticksToTimes([p[4] for p in pending], [p[5] for p in pending]).tolist()
+    for (track, event, startTick, startCount, endTick, endCount), start, end in zip(pending, starts, ends):
+      if type(event) is Note:
+        event.length = end - start
+      self.addEvent(track, event, time = start)
       
 class MidiInfoReader(midi.MidiOutStream):
   """
@@ -1045,7 +1346,7 @@ class MidiInfoReader(midi.MidiOutStream):
   """
 
   # We exit via this exception so that we don't need to read the whole file in
-  class Done: pass
+  class Done(Exception): pass
   
   def __init__(self):
     """Initialize the MidiInfoReader."""
@@ -1053,15 +1354,133 @@ class MidiInfoReader(midi.MidiOutStream):
     self.difficulties = []
 
   def note_on(self, channel, note, velocity):
-    try:
-      track, number = noteMap[note]
-      diff = difficulties[track]
+    mapping = noteTable[note]
+    if mapping:
+      diff = difficulties[mapping[0]]
       if not diff in self.difficulties:
         self.difficulties.append(diff)
         if len(self.difficulties) == len(difficulties):
           raise MidiInfoReader.Done
-    except KeyError:
-      pass
+
+def iterMidiEvents(data):
+  """Decode the note and tempo events of a MIDI file straight from its bytes.
+
+  A lightweight alternative to midi.MidiInFile for well-formed files that
+  skips the event dispatcher. Other channel, meta and sysex events are
+  skipped over.
+
+  Args:
+      data: Contents of a MIDI file as bytes.
+
+  Yields:
+      (track, tick, status, pitch, velocity) for note events, and
+      (track, tick, 0xff, tempo, 0) for tempo changes, with ticks counted
+      from the start of each track.
+
+  Raises:
+      ValueError: If the file has anything unusual in it (stray chunks,
+          system common messages, non-minimal variable length values).
+      IndexError: If the file is truncated.
+  """
+  def readVarLen(pos):
+    value = 0
+    for i in range(4):
+      byte  = data[pos + i]
+      value = (value << 7) | (byte & 0x7f)
+      if not byte & 0x80:
+        # The midi module assumes the shortest encoding
+        if i and not data[pos] & 0x7f:
+          break
+        return value, pos + i + 1
+    raise ValueError("Unsupported variable length value")
+
+  if data[:4] != b"MThd" or int.from_bytes(data[4:8], "big") < 6:
+    raise ValueError("Not a MIDI file")
+  nTracks = int.from_bytes(data[10:12], "big")
+  pos     = 8 + int.from_bytes(data[4:8], "big")
+
+  for track in range(nTracks):
+    if data[pos:pos + 4] != b"MTrk":
+      raise ValueError("Unexpected chunk")
+    end    = pos + 8 + int.from_bytes(data[pos + 4:pos + 8], "big")
+    pos   += 8
+    tick   = 0
+    status = None
+    if end > len(data):
+      raise IndexError("Truncated track")
+
+    while pos < end:
+      delta, pos = readVarLen(pos)
+      tick += delta
+
+      # Running status unless the high bit is set
+      if data[pos] & 0x80:
+        byte = data[pos]
+        pos += 1
+        if byte == 0xff:
+          metaType     = data[pos]
+          length, pos  = readVarLen(pos + 1)
+          if metaType == 0x51:
+            if length != 3:
+              raise ValueError("Unsupported tempo event")
+            yield (track, tick, 0xff, int.from_bytes(data[pos:pos + 3], "big"), 0)
+          pos += length
+          if metaType == 0x2f:
+            break
+          if not length:
+            raise ValueError("Unsupported meta event")
+          continue
+        elif byte == 0xf0:
+          length, pos  = readVarLen(pos)
+          if not length:
+            raise ValueError("Unsupported sysex event")
+          pos         += length - 1
+          if data[pos] == 0xf7:
+            pos += 1
+          continue
+        elif byte >= 0xf0:
+          raise ValueError("Unsupported system common event")
+        status = byte
+      elif status is None:
+        raise ValueError("Running status without a status byte")
+
+      kind = status & 0xf0
+      if kind == 0x80 or kind == 0x90:
+        yield (track, tick, status, data[pos], data[pos + 1])
+      pos += 1 if kind in (0xc0, 0xd0) else 2
+
+    if pos != end:
+      raise ValueError("Track length mismatch")
+
+def readMidiHeader(data):
+  """Return the (format, nTracks, division) header fields of MIDI file data."""
+  return (int.from_bytes(data[8:10], "big"), int.from_bytes(data[10:12], "big"), int.from_bytes(data[12:14], "big"))
+
+def scanDifficulties(data):
+  """Find the difficulties that have notes in raw MIDI file data.
+
+  Gives the same answer as MidiInfoReader for well-formed files, stopping
+  as soon as every difficulty has been seen.
+
+  Args:
+      data: Contents of a MIDI file as bytes.
+
+  Returns:
+      List of difficulty ids, or None if iterMidiEvents() cannot read the
+      file.
+  """
+  found = set()
+  try:
+    for track, tick, status, pitch, velocity in iterMidiEvents(data):
+      if status & 0xf0 == 0x90 and velocity:
+        mapping = noteTable[pitch]
+        if mapping:
+          found.add(mapping[0])
+          if len(found) == len(difficulties):
+            break
+  except (ValueError, IndexError):
+    return None
+  return list(found)
 
 def loadSong(engine, name, library = DEFAULT_LIBRARY, seekable = False, playbackOnly = False, notesOnly = False):
   """Load a complete song with audio and note data.
@@ -1072,7 +1491,7 @@ def loadSong(engine, name, library = DEFAULT_LIBRARY, seekable = False, playback
       library: Library path containing the song (default: "songs").
       seekable: If True, combines guitar into song track for seeking.
       playbackOnly: If True, skips loading note data.
-      notesOnly: Currently unused.
+      notesOnly: If True, skips loading the audio and the script.
 
   Returns:
       Song object ready for playback.
@@ -1102,13 +1521,52 @@ def loadSong(engine, name, library = DEFAULT_LIBRARY, seekable = False, playback
   
   if playbackOnly:
     noteFile = None
+
+  if notesOnly:
+    songFile   = None
+    guitarFile = None
+    rhythmFile = None
+    scriptFile = None
   
   song       = Song(engine, infoFile, songFile, guitarFile, rhythmFile, noteFile, scriptFile)
   return song
 
+# song.ini path -> (file stamps, SongInfo) for songs seen so far
+_songInfoCache = {}
+
+def _songInfoKey(infoFileName):
+  # The difficulties kept in a SongInfo come from notes.mid, so a changed
+  # note file invalidates the entry too
+  try:
+    st = os.stat(infoFileName)
+  except OSError:
+    return None
+  try:
+    notes = os.stat(os.path.join(os.path.dirname(infoFileName), "notes.mid"))
+    notesKey = (notes.st_mtime_ns, notes.st_size)
+  except OSError:
+    notesKey = None
+  return (st.st_mtime_ns, st.st_size, notesKey)
+
+def _isSongInfoCached(infoFileName):
+  cached = _songInfoCache.get(infoFileName)
+  return cached is not None and cached[0] == _songInfoKey(infoFileName)
+
+def _cachedSongInfo(infoFileName):
+  """Return a SongInfo for the file, reusing the last one while the file is unchanged."""
+  key = _songInfoKey(infoFileName)
+  if key is None:
+    return SongInfo(infoFileName)
+  cached = _songInfoCache.get(infoFileName)
+  if cached and cached[0] == key:
+    return cached[1]
+  info = SongInfo(infoFileName)
+  _songInfoCache[infoFileName] = (key, info)
+  return info
+
 def loadSongInfo(engine, name, library = DEFAULT_LIBRARY):
   infoFile   = engine.resource.fileName(library, name, "song.ini", writable = True)
-  return SongInfo(infoFile)
+  return _cachedSongInfo(infoFile)
   
 def createSong(engine, name, guitarTrackName, backgroundTrackName, rhythmTrackName = None, library = DEFAULT_LIBRARY):
   """Create a new song from audio files.
@@ -1173,21 +1631,21 @@ def getAvailableLibraries(engine, library = DEFAULT_LIBRARY):
   songRoots    = [engine.resource.fileName(library),
                   engine.resource.fileName(library, writable = True)]
   libraries    = []
-  libraryRoots = []
+  libraryRoots = set()
   
   for songRoot in songRoots:
-    for libraryRoot in os.listdir(songRoot):
-      libraryRoot = os.path.join(songRoot, libraryRoot)
-      if not os.path.isdir(libraryRoot):
-        continue
-      for name in os.listdir(libraryRoot):
-        # If the directory has at least one song under it or a file called "library.ini", add it
-        if os.path.isfile(os.path.join(libraryRoot, name, "song.ini")) or \
-           name == "library.ini":
-          if not libraryRoot in libraryRoots:
-            libName = library + os.path.join(libraryRoot.replace(songRoot, ""))
-            libraries.append(LibraryInfo(libName, os.path.join(libraryRoot, "library.ini")))
-            libraryRoots.append(libraryRoot)
+    with os.scandir(songRoot) as libraryEntries:
+      libraryRootList = [entry.path for entry in libraryEntries if entry.is_dir()]
+    for libraryRoot in libraryRootList:
+      with os.scandir(libraryRoot) as entries:
+        for entry in entries:
+          # If the directory has at least one song under it or a file called "library.ini", add it
+          if entry.name == "library.ini" or \
+             (entry.is_dir() and os.path.isfile(os.path.join(entry.path, "song.ini"))):
+            if not libraryRoot in libraryRoots:
+              libName = library + os.path.join(libraryRoot.replace(songRoot, ""))
+              libraries.append(LibraryInfo(libName, os.path.join(libraryRoot, "library.ini")))
+              libraryRoots.add(libraryRoot)
             break
   libraries.sort(key=lambda x: x.name)
   return libraries
@@ -1208,14 +1666,25 @@ def getAvailableSongs(engine, library = DEFAULT_LIBRARY, includeTutorials = Fals
   # Search for songs in both the read-write and read-only directories
   songRoots = [engine.resource.fileName(library), engine.resource.fileName(library, writable = True)]
   names = []
+  seen  = set()
   for songRoot in songRoots:
-    for name in os.listdir(songRoot):
-      if not os.path.isfile(os.path.join(songRoot, name, "song.ini")) or name.startswith("."):
-        continue
-      if not name in names:
-        names.append(name)
-
-  songs = [SongInfo(engine.resource.fileName(library, name, "song.ini", writable = True)) for name in names]
+    with os.scandir(songRoot) as entries:
+      for entry in entries:
+        if entry.name.startswith(".") or entry.name in seen or not entry.is_dir():
+          continue
+        if os.path.isfile(os.path.join(entry.path, "song.ini")):
+          names.append(entry.name)
+          seen.add(entry.name)
+
+  # Songs whose song.ini has not changed since the last scan are not parsed
+  # again. The rest are read in parallel first, since that is mostly waiting
+  # on the disk.
+  infoFileNames = [engine.resource.fileName(library, name, "song.ini", writable = True) for name in names]
+  stale = [fileName for fileName in infoFileNames if not _isSongInfoCached(fileName)]
+  if len(stale) > 1:
+    with concurrent.futures.ThreadPoolExecutor(max_workers = 8) as pool:
+      list(pool.map(_cachedSongInfo, stale))
+  songs = [_cachedSongInfo(fileName) for fileName in infoFileNames]
   if not includeTutorials:
     songs = [song for song in songs if not song.tutorial]
   songs.sort(key=lambda x: x.name)
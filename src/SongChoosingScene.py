@@ -93,6 +93,9 @@ class SongChoosingSceneClient(SongChoosingScene, SceneClient):
       libraryName: Currently selected song library/folder path.
       songName: Currently selected song identifier.
   """
+
+  # All per-visit state is set up in createClient(), so instances can be reused
+  reusable = True
   
   def createClient(self, libraryName = None, songName = None):
     """
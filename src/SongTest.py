@@ -31,7 +31,7 @@ import unittest, pygame
 import shutil, os, sys
 
 from GameEngine import GameEngine
-from Song import Song, Note
+from Song import Song, SongInfo, Note, IniParser, difficulties, AMAZING_DIFFICULTY
 
 class SongTest(unittest.TestCase):
   def testLoading(self):
@@ -86,6 +86,88 @@ class SongTest(unittest.TestCase):
       # Load another song to free the copy
       pygame.mixer.music.load(e.resource.fileName("songs", "defy", "guitar.ogg"))
       shutil.rmtree(tmp)
+
+  def testDifficultyCache(self):
+    e = GameEngine()
+
+    tmp = "songtest_tmp"
+    try:
+      os.mkdir(tmp)
+      for f in ["song.ini", "notes.mid"]:
+        shutil.copy(e.resource.fileName("songs", "defy", f), tmp)
+
+      infoFile  = os.path.join(tmp, "song.ini")
+      cacheFile = os.path.join(tmp, "notes.mid.diffcache")
+      diffs1 = [d.id for d in SongInfo(infoFile).getDifficulties()]
+      assert os.path.isfile(cacheFile)
+
+      diffs2 = [d.id for d in SongInfo(infoFile).getDifficulties()]
+      assert diffs1 == diffs2
+
+      # Corrupt or foreign cache files are a miss and get rewritten
+      for payload in [b"", b"\x80\x04N.", b"null", b"7", b'{"key":[1,2],"difficulties":[0]}',
+                      b'{"key":null,"difficulties":5}']:
+        f = open(cacheFile, "wb")
+        f.write(payload)
+        f.close()
+        diffs3 = [d.id for d in SongInfo(infoFile).getDifficulties()]
+        assert diffs1 == diffs3
+        assert open(cacheFile, "rb").read() != payload
+    finally:
+      shutil.rmtree(tmp)
+
+  def testHighscores(self):
+    tmp = "songtest_tmp.ini"
+    try:
+      f = open(tmp, "w")
+      f.write("[song]\nname = Foo\n")
+      f.close()
+
+      amazing = difficulties[AMAZING_DIFFICULTY]
+      info = SongInfo(tmp)
+      info.addHighscore(amazing, 200, 4, "b")
+      info.addHighscore(amazing, 300, 5, "a")
+      info.save()
+
+      info = SongInfo(tmp)
+      assert [s[:2] for s in info.getHighscores(amazing)] == [(300, 5), (200, 4)]
+
+      # Tampered scores are rejected
+      scores = info.getObfuscatedScores()
+      f = open(tmp, "w")
+      f.write("[song]\nscores = %s\n" % scores.replace(scores[4], "A" if scores[4] != "A" else "B"))
+      f.close()
+      assert not SongInfo(tmp).getHighscores(amazing)
+    finally:
+      os.unlink(tmp)
+
+  def testIniParser(self):
+    tmp = "songtest_tmp.ini"
+    try:
+      f = open(tmp, "w")
+      f.write("; comment\n[song]\nName = Foo: bar\n# comment\nartist: Baz\nmulti = a\n  b\n")
+      f.close()
+
+      info = IniParser()
+      info.read(tmp)
+      assert info.get("song", "name") == "Foo: bar"
+      assert info.get("song", "Artist") == "Baz"
+      assert info.get("song", "multi") == "a\nb"
+      assert not info.has_option("song", "delay")
+      assert info.get("song", "delay", fallback = "0") == "0"
+      assert info.get("library", "name", fallback = None) is None
+
+      info.set("song", "delay", "10")
+      f = open(tmp, "w")
+      info.write(f)
+      f.close()
+
+      info = IniParser()
+      info.read(tmp)
+      assert info.get("song", "delay") == "10"
+      assert info.get("song", "multi") == "a\nb"
+    finally:
+      os.unlink(tmp)
     
   
 if __name__ == "__main__":
@@ -38,9 +38,39 @@ respond to the music and player performance.
 from configparser import ConfigParser
 from OpenGL.GL import *
 import math
+from collections import deque
 import Log
 import Theme
 
+# Blending factors by the names used in stage.ini
+blendingFactors = {
+  "zero":                GL_ZERO,
+  "one":                 GL_ONE,
+  "src_color":           GL_SRC_COLOR,
+  "one_minus_src_color": GL_ONE_MINUS_SRC_COLOR,
+  "dst_color":           GL_DST_COLOR,
+  "one_minus_dst_color": GL_ONE_MINUS_DST_COLOR,
+  "src_alpha":           GL_SRC_ALPHA,
+  "one_minus_src_alpha": GL_ONE_MINUS_SRC_ALPHA,
+  "dst_alpha":           GL_DST_ALPHA,
+  "one_minus_dst_alpha": GL_ONE_MINUS_DST_ALPHA,
+  "src_alpha_saturate":  GL_SRC_ALPHA_SATURATE,
+}
+
+# Blending modes that weight the layer by its alpha and keep the background
+# as it is where the layer is transparent
+alphaBlendings = [
+  (GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA),
+  (GL_SRC_ALPHA, GL_ONE),
+]
+
+# Blending modes that keep the background as it is where the layer is
+# black and transparent
+additiveBlendings = [
+  (GL_ONE, GL_ONE),
+  (GL_ONE, GL_ONE_MINUS_SRC_ALPHA),
+]
+
 class Layer(object):
   """
   A graphical stage layer that can have animation effects attached.
@@ -61,6 +91,10 @@ class Layer(object):
       dstBlending: OpenGL destination blending mode.
       effects (list): List of Effect instances attached to this layer.
   """
+
+  __slots__ = ("stage", "drawing", "position", "angle", "scale", "color", "srcBlending",
+               "dstBlending", "effects", "_baseMatrix", "_baseKey")
+
   def __init__(self, stage, drawing):
     """
     Initialize a Layer.
@@ -79,13 +113,17 @@ class Layer(object):
     self.srcBlending = GL_SRC_ALPHA
     self.dstBlending = GL_ONE_MINUS_SRC_ALPHA
     self.effects     = []
+    # The transform before any effects, and the parameters it was built from
+    self._baseMatrix = None
+    self._baseKey    = None
   
   def render(self, visibility):
     """
     Render the layer with all its effects applied.
     
     Transforms the layer based on position, scale, angle, and any attached
-    effects, then draws the texture with the current color and blending.
+    effects, then draws the texture with the current color. The blending
+    mode is set up by the stage, see Stage._renderLayers().
     
     Args:
         visibility: Opacity factor from 0.0 (invisible) to 1.0 (fully visible).
@@ -93,25 +131,42 @@ class Layer(object):
     """
     w, h, = self.stage.engine.view.geometry[2:4]
     v = 1.0 - visibility ** 2
-    self.drawing.transform.reset()
-    self.drawing.transform.translate(w / 2, h / 2)
+    slide = None
     if v > .01:
       self.color = (self.color[0], self.color[1], self.color[2], visibility)
       if self.position[0] < -.25:
-        self.drawing.transform.translate(-v * w, 0)
+        slide = -v * w
       elif self.position[0] > .25:
-        self.drawing.transform.translate(v * w, 0)
-    self.drawing.transform.scale(self.scale[0], -self.scale[1])
-    self.drawing.transform.translate(self.position[0] * w / 2, -self.position[1] * h / 2)
-    self.drawing.transform.rotate(self.angle)
+        slide = v * w
+
+    # The layer's own placement only changes while it slides in or out, so
+    # reuse the previous matrix when nothing it depends on has changed
+    transform = self.drawing.transform
+    key = (w, h, slide, self.position, self.scale, self.angle)
+    if key != self._baseKey:
+      # Centered on the screen, scaled with y pointing up, moved to the
+      # layer's position and rotated, all composed in one go
+      sx, sy = self.scale
+      s, c   = math.sin(self.angle), math.cos(self.angle)
+      x      = w / 2 + (slide or 0.0) + self.position[0] * w / 2
+      y      = h / 2 - self.position[1] * h / 2
+      self._baseMatrix = ( sx * c, -sx * s, x,
+                          -sy * s, -sy * c, y)
+      self._baseKey    = key
+    transform.m = list(self._baseMatrix)
 
     # Blend in all the effects
     for effect in self.effects:
       effect.apply()
+
+    # Skip layers that are too transparent to change the frame buffer, such
+    # as lights that are switched off
+    if self.color[3] < 1.0 / 255:
+      blending = (self.srcBlending, self.dstBlending)
+      if blending in alphaBlendings or (blending in additiveBlendings and not any(self.color)):
+        return
     
-    glBlendFunc(self.srcBlending, self.dstBlending)
     self.drawing.draw(color = self.color)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
 class Effect(object):
   """
@@ -130,6 +185,9 @@ class Effect(object):
       delay (float): Delay before effect starts, in periods.
       triggerProf: Profile function for effect interpolation.
   """
+
+  __slots__ = ("layer", "stage", "intensity", "trigger", "period", "delay", "triggerProf")
+
   def __init__(self, layer, options):
     """
     Initialize an Effect.
@@ -168,10 +226,12 @@ class Effect(object):
     Returns:
         float: Effect intensity from 0.0 to intensity, decaying from beat.
     """
-    if not self.stage.lastBeatPos:
+    stage = self.stage
+    if not stage.lastBeatPos:
       return 0.0
-    t = self.stage.pos - self.delay * self.stage.beatPeriod - self.stage.lastBeatPos
-    return self.intensity * (1.0 - self.triggerProf(0, self.stage.beatPeriod, t))
+    period = stage.beatPeriod
+    t = stage.pos - self.delay * period - stage.lastBeatPos
+    return self.intensity * (1.0 - self.triggerProf(0, period, t))
 
   def triggerQuarterbeat(self):
     """
@@ -180,10 +240,12 @@ class Effect(object):
     Returns:
         float: Effect intensity from 0.0 to intensity, decaying from quarter-beat.
     """
-    if not self.stage.lastQuarterBeatPos:
+    stage = self.stage
+    if not stage.lastQuarterBeatPos:
       return 0.0
-    t = self.stage.pos - self.delay * (self.stage.beatPeriod / 4) - self.stage.lastQuarterBeatPos
-    return self.intensity * (1.0 - self.triggerProf(0, self.stage.beatPeriod / 4, t))
+    period = stage.beatPeriod / 4
+    t = stage.pos - self.delay * period - stage.lastQuarterBeatPos
+    return self.intensity * (1.0 - self.triggerProf(0, period, t))
 
   def triggerPick(self):
     """
@@ -192,9 +254,10 @@ class Effect(object):
     Returns:
         float: Effect intensity from 0.0 to intensity, decaying from pick.
     """
-    if not self.stage.lastPickPos:
+    stage = self.stage
+    if not stage.lastPickPos:
       return 0.0
-    t = self.stage.pos - self.delay * self.period - self.stage.lastPickPos
+    t = stage.pos - self.delay * self.period - stage.lastPickPos
     return self.intensity * (1.0 - self.triggerProf(0, self.period, t))
 
   def triggerMiss(self):
@@ -204,9 +267,10 @@ class Effect(object):
     Returns:
         float: Effect intensity from 0.0 to intensity, decaying from miss.
     """
-    if not self.stage.lastMissPos:
+    stage = self.stage
+    if not stage.lastMissPos:
       return 0.0
-    t = self.stage.pos - self.delay * self.period - self.stage.lastMissPos
+    t = stage.pos - self.delay * self.period - stage.lastMissPos
     return self.intensity * (1.0 - self.triggerProf(0, self.period, t))
 
   def step(self, threshold, x):
@@ -227,9 +291,8 @@ class Effect(object):
       return 0
     if x > max:
       return 1
-    def f(x):
-      return -2 * x**3 + 3*x**2
-    return f((x - min) / (max - min))
+    x = (x - min) / (max - min)
+    return x * x * (3 - 2 * x)
 
   def sinstep(self, min, max, x):
     """Sinusoidal interpolation from 0 to 1 between min and max."""
@@ -245,14 +308,16 @@ class Effect(object):
     Returns:
         tuple: RGB color values interpolated between fret colors.
     """
-    if note >= len(Theme.fretColors) - 1:
-      return Theme.fretColors[-1]
+    colors = Theme.fretColors
+    if note >= len(colors) - 1:
+      return colors[-1]
     elif note <= 0:
-      return Theme.fretColors[0]
-    f2  = note % 1.0
+      return colors[0]
+    i   = int(note)
+    f2  = note - i
     f1  = 1.0 - f2
-    c1 = Theme.fretColors[int(note)]
-    c2 = Theme.fretColors[int(note) + 1]
+    c1 = colors[i]
+    c2 = colors[i + 1]
     return (c1[0] * f1 + c2[0] * f2, \
             c1[1] * f1 + c2[1] * f2, \
             c1[2] * f1 + c2[2] * f2)
@@ -269,6 +334,9 @@ class LightEffect(Effect):
       ambient (float): Base brightness level.
       contrast (float): Brightness variation from trigger.
   """
+
+  __slots__ = ("lightNumber", "ambient", "contrast")
+
   def __init__(self, layer, options):
     """Initialize LightEffect with light_number, ambient, and contrast options."""
     Effect.__init__(self, layer, options)
@@ -293,6 +361,9 @@ class RotateEffect(Effect):
   Attributes:
       angle (float): Maximum rotation angle in radians.
   """
+
+  __slots__ = ("angle",)
+
   def __init__(self, layer, options):
     """Initialize RotateEffect with angle option (in degrees)."""
     Effect.__init__(self, layer, options)
@@ -311,23 +382,35 @@ class WiggleEffect(Effect):
   
   Attributes:
       freq (float): Oscillation frequency.
+      angularFreq (float): The frequency in radians, 2 * pi * freq.
       xmag (float): Horizontal movement magnitude.
       ymag (float): Vertical movement magnitude.
   """
+
+  __slots__ = ("freq", "xmag", "ymag", "angularFreq")
+
   def __init__(self, layer, options):
     """Initialize WiggleEffect with frequency, xmagnitude, ymagnitude options."""
     Effect.__init__(self, layer, options)
     self.freq     = float(options.get("frequency",  6))
     self.xmag     = float(options.get("xmagnitude", 0.1))
     self.ymag     = float(options.get("ymagnitude", 0.1))
+    self.angularFreq = 2 * math.pi * self.freq
 
   def apply(self):
     t = self.trigger()
+    # Most frames fall between triggers, where there is nothing to move
+    if not t:
+      return
     
     w, h = self.stage.engine.view.geometry[2:4]
-    p = t * 2 * math.pi * self.freq
+    p = t * self.angularFreq
     s, c = t * math.sin(p), t * math.cos(p)
-    self.layer.drawing.transform.translate(self.xmag * w * s, self.ymag * h * c)
+    # The wiggle is measured on screen, not in the layer's scaled and
+    # rotated coordinates, so move the translation column directly
+    m = self.layer.drawing.transform.m
+    m[2] += self.xmag * w * s
+    m[5] += self.ymag * h * c
 
 class ScaleEffect(Effect):
   """
@@ -337,6 +420,9 @@ class ScaleEffect(Effect):
       xmag (float): Horizontal scale magnitude.
       ymag (float): Vertical scale magnitude.
   """
+
+  __slots__ = ("xmag", "ymag")
+
   def __init__(self, layer, options):
     """Initialize ScaleEffect with xmagnitude, ymagnitude options."""
     Effect.__init__(self, layer, options)
@@ -347,6 +433,14 @@ class ScaleEffect(Effect):
     t = self.trigger()
     self.layer.drawing.transform.scale(1.0 + self.xmag * t, 1.0 + self.ymag * t)
 
+# Effect types that can be used in the stage configuration
+fxClasses = {
+  "light":          LightEffect,
+  "rotate":         RotateEffect,
+  "wiggle":         WiggleEffect,
+  "scale":          ScaleEffect,
+}
+
 class Stage(object):
   """
   Stage background manager for gameplay visuals.
@@ -369,7 +463,9 @@ class Stage(object):
       lastBeatPos: Position of the last beat event.
       lastPickPos: Position of the last successful note pick.
       lastMissPos: Position of the last missed note.
-      averageNotes (list): Rolling average of played note values.
+      playedNotes (deque): Average note of each of the last four picks.
+      averageNotes (deque): Pick average as it was at each of the last
+          few beats, the current one last.
   """
   def __init__(self, guitarScene, configFileName):
     """
@@ -390,12 +486,14 @@ class Stage(object):
     self.config.read(configFileName)
 
     # Build the layers
+    sections = set(self.config.sections())
     for i in range(32):
       section = "layer%d" % i
-      if self.config.has_section(section):
+      if section in sections:
+        layerOptions = dict(self.config.items(section))
         def get(value, type = str, default = None):
-          if self.config.has_option(section, value):
-            return type(self.config.get(section, value))
+          if value in layerOptions:
+            return type(layerOptions[value])
           return default
         
         xres    = get("xres", int, 256)
@@ -413,29 +511,20 @@ class Stage(object):
         layer.position    = (get("xpos",   float, 0.0), get("ypos",   float, 0.0))
         layer.scale       = (get("xscale", float, 1.0), get("yscale", float, 1.0))
         layer.angle       = math.pi * get("angle", float, 0.0) / 180.0
-        layer.srcBlending = globals()["GL_%s" % get("src_blending", str, "src_alpha").upper()]
-        layer.dstBlending = globals()["GL_%s" % get("dst_blending", str, "one_minus_src_alpha").upper()]
+        layer.srcBlending = blendingFactors[get("src_blending", str, "src_alpha").lower()]
+        layer.dstBlending = blendingFactors[get("dst_blending", str, "one_minus_src_alpha").lower()]
         layer.color       = (get("color_r", float, 1.0), get("color_g", float, 1.0), get("color_b", float, 1.0), get("color_a", float, 1.0))
 
         # Load any effects
-        fxClasses = {
-          "light":          LightEffect,
-          "rotate":         RotateEffect,
-          "wiggle":         WiggleEffect,
-          "scale":          ScaleEffect,
-        }
-        
         for j in range(32):
           fxSection = "layer%d:fx%d" % (i, j)
-          if self.config.has_section(fxSection):
-            type = self.config.get(fxSection, "type")
+          if fxSection in sections:
+            options = dict(self.config.items(fxSection))
+            type    = options.get("type")
 
             if not type in fxClasses:
               continue
 
-            options = self.config.options(fxSection)
-            options = dict([(opt, self.config.get(fxSection, opt)) for opt in options])
-
             fx = fxClasses[type](layer, options)
             layer.effects.append(fx)
 
@@ -453,8 +542,8 @@ class Stage(object):
     self.beat               = 0
     self.quarterBeat        = 0
     self.pos                = 0.0
-    self.playedNotes        = []
-    self.averageNotes       = [0.0]
+    self.playedNotes        = deque(maxlen = 4)
+    self.averageNotes       = deque([0.0], maxlen = 5)
     self.beatPeriod         = 0.0
 
   def triggerPick(self, pos, notes):
@@ -467,7 +556,7 @@ class Stage(object):
     """
     if notes:
       self.lastPickPos      = pos
-      self.playedNotes      = self.playedNotes[-3:] + [sum(notes) / float(len(notes))]
+      self.playedNotes.append(sum(notes) / float(len(notes)))
       self.averageNotes[-1] = sum(self.playedNotes) / float(len(self.playedNotes))
 
   def triggerMiss(self, pos):
@@ -500,22 +589,30 @@ class Stage(object):
     """
     self.lastBeatPos  = pos
     self.beat         = beat
-    self.averageNotes = self.averageNotes[-4:] + self.averageNotes[-1:]
+    self.averageNotes.append(self.averageNotes[-1])
 
   def _renderLayers(self, layers, visibility):
     """
-    Render a list of layers with orthogonal projection.
+    Render a list of layers.
+    
+    The blending mode is only changed between layers that use different
+    ones, and the default is restored once all of them have been drawn.
+    No projection is set up here since each drawing sets up its own.
     
     Args:
         layers: List of Layer instances to render.
         visibility: Opacity factor from 0.0 to 1.0.
     """
-    self.engine.view.setOrthogonalProjection(normalize = True)
+    blending = None
     try:
       for layer in layers:
+        if blending != (layer.srcBlending, layer.dstBlending):
+          blending = (layer.srcBlending, layer.dstBlending)
+          glBlendFunc(*blending)
         layer.render(visibility)
     finally:
-      self.engine.view.resetProjection()
+      if blending is not None and blending != (GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA):
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
   def run(self, pos, period):
     """
@@ -534,7 +631,7 @@ class Stage(object):
     if quarterBeat > self.quarterBeat:
       self.triggerQuarterBeat(pos, quarterBeat)
 
-    beat = quarterBeat / 4
+    beat = quarterBeat // 4
 
     if beat > self.beat:
       self.triggerBeat(pos, beat)
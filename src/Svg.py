@@ -57,7 +57,8 @@ import os
 import io
 from xml import sax
 from OpenGL.GL import *
-from numpy import reshape, dot, transpose, identity, zeros, float32
+from numpy import array, float32
+from functools import lru_cache
 from math import sin, cos
 
 import Log
@@ -115,8 +116,9 @@ class SvgGradient:
     self.transform = transform
 
   def applyTransform(self, transform):
-    m = dot(transform.matrix, self.transform.matrix)
-    self.gradientDesc.SetMatrix(transform.getGMatrix(m))
+    m = SvgTransform(transform)
+    m.transform(self.transform)
+    self.gradientDesc.SetMatrix(transform.getGMatrix(m.m))
 
 class SvgContext:
   """OpenGL rendering context for SVG drawing operations.
@@ -214,6 +216,23 @@ class SvgContext:
     """
     self.drawBoard.Clear(r, g, b, a)
 
+styleRe = re.compile(r"(.+?):\s*(.+?)(;|$)\s*")
+
+@lru_cache(maxsize = 1024)
+def parseStyleItems(style):
+  """Split a CSS style string into its properties.
+
+  Drawings tend to repeat the same few style strings, so the results
+  are cached.
+
+  Args:
+      style: CSS style string (e.g., "stroke:#000;fill:#fff").
+
+  Returns:
+      Tuple of (name, value) pairs in the order they appear.
+  """
+  return tuple((m.group(1), m.group(2)) for m in styleRe.finditer(style))
+
 class SvgRenderStyle:
   """Manages stroke and fill styling for SVG rendering.
   
@@ -229,6 +248,8 @@ class SvgRenderStyle:
       fillOpacity: Fill opacity (0.0-1.0).
   """
   
+  urlRe = re.compile(r"url\(#(.+)\)")
+
   def __init__(self, baseStyle = None):
     """Initialize a render style, optionally copying from a base style.
     
@@ -254,10 +275,7 @@ class SvgRenderStyle:
     Returns:
         Dictionary mapping style property names to values.
     """
-    s = {}
-    for m in re.finditer(r"(.+?):\s*(.+?)(;|$)\s*", style):
-      s[m.group(1)] = m.group(2)
-    return s
+    return dict(parseStyleItems(style))
 
   def parseColor(self, color, defs = None):
     if color.lower() == "none":
@@ -277,7 +295,7 @@ class SvgRenderStyle:
       if not defs:
         Log.warn("No patterns or gradients defined.")
         return None
-      m = re.match(r"url\(#(.+)\)", color)
+      m = self.urlRe.match(color)
       if m:
         id = m.group(1)
         if not id in defs:
@@ -285,11 +303,10 @@ class SvgRenderStyle:
         return defs.get(id)
 
   def __eq__(self, s):
-    if s:
-      for k, v in list(self.__dict__.items()):
-        if v != getattr(s, k):
-          return False
+    if self is s:
       return True
+    if isinstance(s, SvgRenderStyle):
+      return self.__dict__ == s.__dict__
     return False
 
   def __ne__(self, s):
@@ -363,12 +380,18 @@ class SvgTransform:
   """2D transformation matrix for SVG coordinate transformations.
   
   Supports translation, rotation, scaling, and arbitrary matrix transforms.
-  Wraps a 3x3 homogeneous transformation matrix using NumPy.
+  The affine matrix is kept as six plain floats, since NumPy's per-call
+  overhead dwarfs the arithmetic on a matrix this small.
   
   Attributes:
-      matrix: 3x3 NumPy array representing the transformation matrix.
+      m: Affine matrix [a, b, c, d, e, f] in row-major order, standing for
+          [[a, b, c], [d, e, f], [0, 0, 1]].
+      matrix: The same matrix as a 3x3 NumPy array.
   """
   
+  translateRe = re.compile(r"translate\(\s*(.+?)\s*,(.+?)\s*\)")
+  matrixRe    = re.compile(r"matrix\(\s*" + r"\s*,\s*".join(["(.+?)"] * 6) + r"\s*\)")
+
   def __init__(self, baseTransform = None):
     """Initialize a transform, optionally copying from a base transform.
     
@@ -379,22 +402,33 @@ class SvgTransform:
     self.reset()
     
     if baseTransform:
-      self.matrix = baseTransform.matrix.copy()
+      self.m = list(baseTransform.m)
+
+  def _getMatrix(self):
+    a, b, c, d, e, f = self.m
+    return array([[a, b, c], [d, e, f], [0.0, 0.0, 1.0]], float32)
+
+  def _setMatrix(self, matrix):
+    self.m = [float(v) for v in matrix[0]] + [float(v) for v in matrix[1]]
+
+  matrix = property(_getMatrix, _setMatrix)
 
   def applyAttributes(self, attrs, key = "transform"):
     transform = attrs.get(key)
     if transform:
-      m = re.match(r"translate\(\s*(.+?)\s*,(.+?)\s*\)", transform)
+      m = self.translateRe.match(transform)
       if m:
         dx, dy = [float(c) for c in m.groups()]
-        self.matrix[0, 2] += dx
-        self.matrix[1, 2] += dy
-      m = re.match(r"matrix\(\s*" + r"\s*,\s*".join(["(.+?)"] * 6) + r"\s*\)", transform)
+        self.translate(dx, dy)
+      m = self.matrixRe.match(transform)
       if m:
-        e = [float(c) for c in m.groups()]
-        e = [e[0], e[2], e[4], e[1], e[3], e[5], 0, 0, 1]
-        m = reshape(e, (3, 3))
-        self.matrix = dot(self.matrix, m)
+        a, b, c, d, e, f = [float(c) for c in m.groups()]
+        self._multiply(a, c, e, b, d, f)
+
+  def _multiply(self, na, nb, nc, nd, ne, nf):
+    a, b, c, d, e, f = self.m
+    self.m = [a * na + b * nd, a * nb + b * ne, a * nc + b * nf + c,
+              d * na + e * nd, d * nb + e * ne, d * nc + e * nf + f]
 
   def transform(self, transform):
     """Concatenate another transform with this one.
@@ -402,23 +436,22 @@ class SvgTransform:
     Args:
         transform: SvgTransform to multiply with this transform.
     """
-    self.matrix = dot(self.matrix, transform.matrix)
+    self._multiply(*transform.m)
 
   def reset(self):
     """Reset the transform to the identity matrix."""
-    self.matrix = identity(3, float32)
+    self.m = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0]
 
   def translate(self, dx, dy):
-    """Apply a translation to the transform.
+    """Apply a translation in the transform's local coordinates.
     
     Args:
         dx: Translation in the X direction.
         dy: Translation in the Y direction.
     """
-    m = zeros((3, 3))
-    m[0, 2] = dx
-    m[1, 2] = dy
-    self.matrix += m
+    m = self.m
+    m[2] += m[0] * dx + m[1] * dy
+    m[5] += m[3] * dx + m[4] * dy
 
   def rotate(self, angle):
     """Apply a rotation to the transform.
@@ -426,14 +459,14 @@ class SvgTransform:
     Args:
         angle: Rotation angle in radians.
     """
-    m = identity(3, float32)
+    m = self.m
     s = sin(angle)
     c = cos(angle)
-    m[0, 0] =  c
-    m[0, 1] = -s
-    m[1, 0] =  s
-    m[1, 1] =  c
-    self.matrix = dot(self.matrix, m)
+    a, b, d, e = m[0], m[1], m[3], m[4]
+    m[0] =  a * c + b * s
+    m[1] = -a * s + b * c
+    m[3] =  d * c + e * s
+    m[4] = -d * s + e * c
 
   def scale(self, sx, sy):
     """Apply a scale transformation.
@@ -442,30 +475,29 @@ class SvgTransform:
         sx: Scale factor in the X direction.
         sy: Scale factor in the Y direction.
     """
-    m = identity(3, float32)
-    m[0, 0] = sx
-    m[1, 1] = sy
-    self.matrix = dot(self.matrix, m)
+    m = self.m
+    m[0] *= sx
+    m[3] *= sx
+    m[1] *= sy
+    m[4] *= sy
 
   def applyGL(self):
     # Interpret the 2D matrix as 3D
-    m = self.matrix
-    m = [m[0, 0], m[1, 0], 0.0, 0.0,
-         m[0, 1], m[1, 1], 0.0, 0.0,
-             0.0,     0.0, 1.0, 0.0,
-         m[0, 2], m[1, 2], 0.0, 1.0]
-    glMultMatrixf(m)
+    a, b, c, d, e, f = self.m
+    glMultMatrixf([  a,   d, 0.0, 0.0,
+                     b,   e, 0.0, 0.0,
+                   0.0, 0.0, 1.0, 0.0,
+                     c,   f, 0.0, 1.0])
 
   def getGMatrix(self, m):
     f = float
-    self._gmatrix.Set( \
-      f(m[0, 0]), f(m[0, 1]), f(m[0, 2]), \
-      f(m[1, 0]), f(m[1, 1]), f(m[1, 2]), \
-      f(m[2, 0]), f(m[2, 1]), f(m[2, 2]))
+    self._gmatrix.Set(f(m[0]), f(m[1]), f(m[2]),
+                      f(m[3]), f(m[4]), f(m[5]),
+                      0.0, 0.0, 1.0)
     return self._gmatrix
 
   def apply(self, drawBoard):
-    drawBoard.SetModelViewMatrix(self.getGMatrix(self.matrix))
+    drawBoard.SetModelViewMatrix(self.getGMatrix(self.m))
 
 class SvgHandler(sax.ContentHandler):
   """SAX content handler for parsing SVG XML documents.
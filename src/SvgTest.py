@@ -30,6 +30,7 @@ Tests SVG rendering, transformations, and render-to-texture functionality.
 import unittest
 from GameEngine import GameEngine
 from Texture import Texture
+from Svg import SvgTransform
 
 from OpenGL.GL import *
 from OpenGL.GLU import *
@@ -96,5 +97,31 @@ class SvgTest(unittest.TestCase):
 
     glClear(GL_COLOR_BUFFER_BIT | GL_STENCIL_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
+class SvgTransformTest(unittest.TestCase):
+  def _apply(self, transform, x, y):
+    a, b, c, d, e, f = transform.m
+    return (a * x + b * y + c, d * x + e * y + f)
+
+  def testTranslateAfterScale(self):
+    t = SvgTransform()
+    t.scale(2, 2)
+    t.translate(1, 1)
+    self.assertEqual(self._apply(t, 0, 0), (2, 2))
+
+  def testTranslateAfterRotate(self):
+    t = SvgTransform()
+    t.translate(10, 0)
+    t.rotate(3.141592653589793 / 2)
+    t.translate(1, 0)
+    x, y = self._apply(t, 0, 0)
+    self.assertAlmostEqual(x, 10)
+    self.assertAlmostEqual(y, 1)
+
+  def testTranslateAttribute(self):
+    t = SvgTransform()
+    t.scale(2, 3)
+    t.applyAttributes({"transform": "translate(1, 1)"})
+    self.assertEqual(self._apply(t, 0, 0), (2, 3))
+
 if __name__ == "__main__":
   unittest.main()